@@ -6,24 +6,35 @@
 from __future__ import annotations
 
 import os
-import json
+import asyncio
+import copy
+import time
 import re
-import base64
+import binascii
 import random
+import signal
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import calendar
+import heapq
+import threading
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timedelta, date
 from zoneinfo import ZoneInfo, available_timezones, ZoneInfoNotFoundError
-from threading import Thread
-from typing import Any, Dict, Tuple, Optional, List
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Tuple, Optional, List
 from dotenv import load_dotenv
 
 import discord
 from discord.ext import tasks
 from discord import app_commands
-from flask import Flask
+import orjson
+
+if TYPE_CHECKING:
+    from aiohttp import web
 
 load_dotenv()
 
@@ -43,6 +54,9 @@ MILES_PATH = os.getenv("MAPTAP_MILES_PATH", "data/maptap_miles.json")
 MAPTAP_URL = os.getenv("MAPTAP_URL", "https://www.maptap.gg")
 CLEANUP_DAYS = int(os.getenv("MAPTAP_CLEANUP_DAYS", "69"))
 MAX_SCORE = int(os.getenv("MAPTAP_MAX_SCORE", "1000"))
+SETTINGS_CACHE_TTL = float(os.getenv("MAPTAP_SETTINGS_CACHE_TTL", "60"))
+DATA_CACHE_TTL = float(os.getenv("MAPTAP_DATA_CACHE_TTL", "5"))
+WRITE_BEHIND_SECONDS = float(os.getenv("MAPTAP_WRITE_BEHIND_SECONDS", "3"))
 
 # Optional: to make slash commands appear instantly in a specific guild during dev
 GUILD_ID = os.getenv("MAPTAP_GUILD_ID", "").strip()
@@ -64,6 +78,14 @@ TOPGG_TOKEN = os.getenv("TOPGG_TOKEN")
 SCORE_REGEX = re.compile(r"Final\s*score:\s*(\d+)", re.IGNORECASE)
 ROUND_ZERO_REGEX = re.compile(r"(^|\s)0(?!\d)")
 MAPTAP_HINT_REGEX = re.compile(r"\bmaptap\.gg\b", re.IGNORECASE)
+# Same hour/minute patterns strptime("%H:%M") uses, without its
+# per-call format lookup and exception on failure.
+HHMM_REGEX = re.compile(r"(2[0-3]|[0-1]\d|\d):([0-5]\d|\d)")
+
+# Bound once: these run on every candidate message (and every line of it).
+_score_search = SCORE_REGEX.search
+_round_zero_search = ROUND_ZERO_REGEX.search
+_hint_search = MAPTAP_HINT_REGEX.search
 
 
 # =====================================================
@@ -146,8 +168,12 @@ _retry_strategy = Retry(
     allowed_methods=["GET", "PUT", "POST"],
     raise_on_status=False,
 )
+# One shared session so GitHub / top.gg calls reuse keep-alive TCP+TLS
+# connections. GitHub I/O now runs on worker threads and independent reads
+# are gathered concurrently, so keep enough pooled connections per host
+# for those to overlap without opening (and discarding) extra sockets.
 SESSION = requests.Session()
-_adapter = HTTPAdapter(max_retries=_retry_strategy)
+_adapter = HTTPAdapter(max_retries=_retry_strategy, pool_connections=4, pool_maxsize=8)
 SESSION.mount("https://", _adapter)
 SESSION.mount("http://", _adapter)
 
@@ -158,15 +184,24 @@ HTTP_TIMEOUT = (10, 25)
 # =====================================================
 # KEEP ALIVE (Render)
 # =====================================================
-app = Flask("maptap")
-
-@app.get("/")
-def home():
-    return "MapTap bot running"
-
-def run_web():
+# Served from the bot's own event loop with aiohttp (already a discord.py
+# dependency) rather than Flask on a side thread. aiohttp.web is imported
+# lazily: discord.py doesn't pull it in, and it's only needed once the bot
+# actually starts, not on every import of this module.
+async def home(request: web.Request) -> web.Response:
+    from aiohttp import web
+    return web.Response(text="MapTap bot running")
+
+async def start_web() -> web.AppRunner:
+    from aiohttp import web
+    app = web.Application()
+    app.router.add_get("/", home)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
     port = int(os.getenv("PORT", "10000"))
-    app.run(host="0.0.0.0", port=port)
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    print(f"✅ Keep-alive web server listening on :{port}")
+    return runner
 
 # =====================================================
 # GITHUB HELPERS
@@ -174,37 +209,161 @@ def run_web():
 def _gh_url(path: str) -> str:
     return f"https://api.github.com/repos/{GITHUB_REPO}/contents/{path}"
 
-def github_load_json(path: str, default: Any) -> Tuple[Any, Optional[str]]:
+# The SESSION retry above covers 5xx/429, but GitHub's *secondary* rate
+# limit, and an exhausted primary quota, come back as a 403 with
+# Retry-After / X-RateLimit-Reset headers, which urllib3 treats as final.
+# Nothing here sleeps through those: most calls run while a handler holds a
+# data_lock, often with an interaction waiting on the reply, so they fail
+# fast. The write-behind flush has nobody waiting on it, so it keeps its
+# queue and waits the limit out instead (see flush_github_writes).
+GH_RATE_LIMIT_LOW_WATER = 50
+
+def _gh_rate_limit_wait(r: Optional[requests.Response]) -> Optional[float]:
+    """Seconds until GitHub will take requests again, or None if r isn't a rate-limit response."""
+    if r is None or r.status_code != 403:
+        return None
+
+    retry_after = r.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+
+    if r.headers.get("X-RateLimit-Remaining") == "0":
+        reset = r.headers.get("X-RateLimit-Reset", "")
+        if reset.isdigit():
+            return max(int(reset) - time.time(), 1.0)
+
+    # A 403 without any rate-limit hint is a genuine permission error.
+    return None
+
+def _gh_request(method: str, url: str, extra_headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> requests.Response:
+    headers = {**HEADERS, **extra_headers} if extra_headers else HEADERS
+    r = SESSION.request(method, url, headers=headers, timeout=HTTP_TIMEOUT, **kwargs)
+
+    remaining = r.headers.get("X-RateLimit-Remaining", "")
+    if remaining.isdigit() and int(remaining) < GH_RATE_LIMIT_LOW_WATER:
+        print(f"⚠️ GitHub rate limit low: {remaining} requests left")
+
+    wait = _gh_rate_limit_wait(r)
+    if wait is not None:
+        print(f"⏳ GitHub rate limited ({r.status_code}) on {method} {url}, lifts in {wait:.0f}s")
+    return r
+
+# The scores/users files are the biggest thing this bot parses and
+# serialises, on nearly every command. orjson is several times faster than
+# the stdlib for both directions, and both sides work on raw UTF-8 bytes so
+# there's no str round-trip around the base64 step.
+def _json_loads(content: bytes) -> Any:
+    return orjson.loads(content)
+
+# The scores/users files are rewritten on every save and only ever read by
+# this bot, so they're stored compact (indentation was ~30% of their size,
+# all of it base64-encoded and uploaded each time). The small, hand-checked
+# settings and miles files stay pretty-printed for readable diffs.
+PRETTY_JSON_PATHS = {SETTINGS_PATH, MILES_PATH}
+
+def _json_dumps(data: Any, path: str) -> bytes:
+    pretty = path in PRETTY_JSON_PATHS
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    return orjson.dumps(data, option=option)
+
+# Last known contents per path: {path: (json_bytes, sha, etag, fetched_at)}.
+# Reads send If-None-Match, and a 304 (which GitHub doesn't count against
+# the rate limit) re-parses the cached bytes instead of downloading and
+# base64-decoding the whole file again. Callers that pass max_age skip the
+# request entirely while the entry is younger than that (monotonic seconds).
+# The decoded bytes are kept rather than the parsed object because every
+# caller mutates what it gets back. Saves store what they wrote with an
+# empty etag, so the next revalidation does a full GET.
+# The lock is needed because loads/saves run on asyncio.to_thread workers.
+_GH_CACHE: Dict[str, Tuple[bytes, Optional[str], str, float]] = {}
+_GH_CACHE_LOCK = threading.Lock()
+
+# Paths with local changes not yet written to GitHub (see queue_github_save):
+# {path: (version, commit message)}. Their _GH_CACHE entry holds the local
+# text and the last *remote* sha, and is what every read returns until the
+# write-behind flush lands.
+_GH_DIRTY: Dict[str, Tuple[int, str]] = {}
+_GH_DIRTY_VERSION = 0
+
+# Local revision of each path's contents, bumped (under _GH_CACHE_LOCK)
+# whenever what a read returns changes: a queued save, a landed PUT, or a
+# fetch of a new remote version. Unlike the sha it also moves on deferred
+# saves, so caches derived from file contents key on it instead.
+_GH_REVISION: Dict[str, int] = {}
+
+def data_revision(path: str) -> int:
+    """
+    Current revision of path. Read it *before* loading the data you derive
+    from, so a cache entry never holds data older than its key.
+    """
+    with _GH_CACHE_LOCK:
+        return _GH_REVISION.get(path, 0)
+
+def _bump_revision(path: str) -> None:
+    # Caller holds _GH_CACHE_LOCK.
+    _GH_REVISION[path] = _GH_REVISION.get(path, 0) + 1
+
+def _gh_decode(content: bytes, sha: Optional[str], default: Any) -> Tuple[Any, Optional[str]]:
+    if not content.strip():
+        return default, sha
+    return _json_loads(content), sha
+
+def github_load_json(path: str, default: Any, max_age: float = 0.0) -> Tuple[Any, Optional[str]]:
     url = _gh_url(path)
+    with _GH_CACHE_LOCK:
+        cached = _GH_CACHE.get(path)
+        dirty = path in _GH_DIRTY
+        revision = _GH_REVISION.get(path, 0)
+
+    if cached and (dirty or (max_age > 0 and time.monotonic() - cached[3] < max_age)):
+        return _gh_decode(cached[0], cached[1], default)
+
+    extra_headers = {"If-None-Match": cached[2]} if cached and cached[2] else None
     try:
-        r = SESSION.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
+        r = _gh_request("GET", url, extra_headers)
     except requests.exceptions.RequestException as e:
         print(f"⚠️ GitHub load failed for {path} after retries: {e}")
         raise
 
     if r.status_code == 404:
-        return default, None
-
-    r.raise_for_status()
-    payload = r.json()
-    content_b64 = payload.get("content", "")
-    content = base64.b64decode(content_b64).decode("utf-8") if content_b64 else ""
-
-    if not content.strip():
-        return default, payload.get("sha")
+        content, sha, etag = b"", None, ""
+    elif r.status_code == 304 and cached:
+        content, sha, etag = cached[0], cached[1], cached[2]
+    else:
+        r.raise_for_status()
+        payload = r.json()
+        content_b64 = payload.get("content", "")
+        content = binascii.a2b_base64(content_b64) if content_b64 else b""
+        sha = payload.get("sha")
+        etag = r.headers.get("ETag", "")
+
+    with _GH_CACHE_LOCK:
+        if _GH_REVISION.get(path, 0) != revision and path in _GH_CACHE:
+            # Saved or queued locally while we were fetching: that's newer
+            # than what we fetched, so don't cache over it.
+            local = _GH_CACHE[path]
+            return _gh_decode(local[0], local[1], default)
+        if (cached[1] if cached else None) != sha:
+            _bump_revision(path)
+        if r.status_code == 404:
+            _GH_CACHE.pop(path, None)
+        else:
+            _GH_CACHE[path] = (content, sha, etag, time.monotonic())
 
-    return json.loads(content), payload.get("sha")
+    if r.status_code == 404:
+        return default, None
+    return _gh_decode(content, sha, default)
 
-def github_save_json(path: str, data: Any, sha: Optional[str], message: str) -> str:
+def _github_put(path: str, raw: bytes, sha: Optional[str], message: str) -> Optional[str]:
     url = _gh_url(path)
-    encoded = base64.b64encode(json.dumps(data, indent=2).encode("utf-8")).decode("utf-8")
+    encoded = binascii.b2a_base64(raw, newline=False).decode("ascii")
 
     body: Dict[str, Any] = {"message": message, "content": encoded}
     if sha:
         body["sha"] = sha
 
     try:
-        r = SESSION.put(url, headers=HEADERS, json=body, timeout=HTTP_TIMEOUT)
+        r = _gh_request("PUT", url, json=body)
     except requests.exceptions.RequestException as e:
         print(f"⚠️ GitHub save failed for {path} after retries: {e}")
         raise
@@ -212,19 +371,140 @@ def github_save_json(path: str, data: Any, sha: Optional[str], message: str) ->
     if r.status_code == 409 and sha:
         # Someone else updated the file between our load and save (stale
         # sha) — a normal race under concurrent saves, not a network
-        # failure. Re-fetch the current sha and retry once.
+        # failure. Re-fetch the current sha and retry once. (Straight from
+        # GitHub, not github_load_json, which may answer from _GH_CACHE.)
         try:
-            _latest, latest_sha = github_load_json(path, None)
+            latest = _gh_request("GET", url)
+            latest_sha = latest.json().get("sha") if latest.status_code == 200 else None
             if latest_sha:
                 body["sha"] = latest_sha
-                r = SESSION.put(url, headers=HEADERS, json=body, timeout=HTTP_TIMEOUT)
+                r = _gh_request("PUT", url, json=body)
         except requests.exceptions.RequestException as e:
             print(f"⚠️ GitHub save retry-after-409 failed for {path}: {e}")
 
     r.raise_for_status()
-    new_sha = r.json().get("content", {}).get("sha")
+    return r.json().get("content", {}).get("sha")
+
+def _gh_cache_after_put(path: str, raw: bytes, new_sha: Optional[str], version: Optional[int]) -> None:
+    """Record a successful PUT. If the path was queued again while the PUT
+    was in flight, keep the newer pending text and only move the sha on."""
+    with _GH_CACHE_LOCK:
+        pending = _GH_DIRTY.get(path)
+        if pending is not None and pending[0] != version:
+            current = _GH_CACHE[path]
+            _GH_CACHE[path] = (current[0], new_sha, "", current[3])
+            return
+        _GH_DIRTY.pop(path, None)
+        _GH_CACHE[path] = (raw, new_sha, "", time.monotonic())
+        _bump_revision(path)
+
+def github_save_json(path: str, data: Any, sha: Optional[str], message: str) -> str:
+    # Callers hold data_lock(path) from their load, so `data` was built on
+    # top of any queued text and the PUT supersedes that queued version.
+    with _GH_CACHE_LOCK:
+        pending = _GH_DIRTY.get(path)
+    raw = _json_dumps(data, path)
+    new_sha = _github_put(path, raw, sha, message)
+    _gh_cache_after_put(path, raw, new_sha, pending[0] if pending else None)
     return new_sha or sha or ""
 
+# -----------------------------------------------------
+# Async wrappers
+# -----------------------------------------------------
+# Everything above is blocking `requests` I/O. Called straight from a
+# coroutine it freezes the whole discord.py event loop (heartbeats, other
+# interactions, the scheduler) for the full GitHub round-trip. These run
+# the same helpers on a worker thread instead, so the retrying SESSION
+# above is kept as-is and async code just awaits them.
+async def github_load_json_async(path: str, default: Any, max_age: float = 0.0) -> Tuple[Any, Optional[str]]:
+    return await asyncio.to_thread(github_load_json, path, default, max_age)
+
+async def github_save_json_async(path: str, data: Any, sha: Optional[str], message: str) -> str:
+    return await asyncio.to_thread(github_save_json, path, data, sha, message)
+
+# -----------------------------------------------------
+# Data file locks
+# -----------------------------------------------------
+# With the I/O awaited, two handlers can both load a file before either
+# saves it, and the second save then overwrites the first. Every
+# load -> change -> save of a data file holds that file's lock from the
+# load until the save (or queue_github_save) is done. asyncio.Lock isn't
+# re-entrant, so the save helpers below don't take it themselves: the
+# handler that owns the whole sequence does.
+_DATA_LOCKS: Dict[str, asyncio.Lock] = {}
+
+@asynccontextmanager
+async def data_lock(*paths: str):
+    """Hold the locks for these data files. Always taken in sorted order, so
+    handlers that need several files can't deadlock against each other."""
+    async with AsyncExitStack() as stack:
+        for path in sorted(set(paths)):
+            lock = _DATA_LOCKS.get(path)
+            if lock is None:
+                lock = _DATA_LOCKS[path] = asyncio.Lock()
+            await stack.enter_async_context(lock)
+        yield
+
+# -----------------------------------------------------
+# Write-behind
+# -----------------------------------------------------
+# Every score post used to cost two GitHub commits (scores + users) before
+# the handler could finish. on_message now only records the new contents
+# locally; the flush_pending_writes loop commits each dirty file at most
+# once per WRITE_BEHIND_SECONDS, so a burst of posts becomes one commit per
+# file. Reads see the local contents immediately (github_load_json).
+def queue_github_save(path: str, data: Any, sha: Optional[str], message: str) -> None:
+    global _GH_DIRTY_VERSION
+    raw = _json_dumps(data, path)
+    with _GH_CACHE_LOCK:
+        cached = _GH_CACHE.get(path)
+        remote_sha = cached[1] if cached else sha
+        _GH_DIRTY_VERSION += 1
+        _GH_DIRTY[path] = (_GH_DIRTY_VERSION, message)
+        _GH_CACHE[path] = (raw, remote_sha, "", time.monotonic())
+        _bump_revision(path)
+
+def _flush_path(path: str) -> None:
+    with _GH_CACHE_LOCK:
+        pending = _GH_DIRTY.get(path)
+        cached = _GH_CACHE.get(path)
+    if pending is None or cached is None:
+        return
+    version, message = pending
+    raw, sha = cached[0], cached[1]
+    new_sha = _github_put(path, raw, sha, message)
+    _gh_cache_after_put(path, raw, new_sha, version)
+
+# Monotonic time before which flushes are skipped, set when GitHub
+# rate-limits one. Queued files stay queued (and readable) until then.
+_FLUSH_STATE: Dict[str, float] = {"not_before": 0.0}
+
+async def flush_github_writes() -> None:
+    if time.monotonic() < _FLUSH_STATE["not_before"]:
+        return
+
+    with _GH_CACHE_LOCK:
+        paths = list(_GH_DIRTY)
+    for path in paths:
+        # Sequential on purpose: parallel Contents API PUTs race each other
+        # for the branch head and come back 409. The file lock keeps the
+        # PUT from overlapping a handler's immediate save of the same file,
+        # which would otherwise land first and then be overwritten with
+        # this older snapshot.
+        try:
+            async with data_lock(path):
+                await asyncio.to_thread(_flush_path, path)
+        except requests.exceptions.HTTPError as e:
+            wait = _gh_rate_limit_wait(e.response)
+            if wait is None:
+                print(f"⚠️ Write-behind flush failed for {path}, will retry: {e}")
+                continue
+            _FLUSH_STATE["not_before"] = time.monotonic() + wait
+            print(f"⏳ Write-behind flush paused for {wait:.0f}s by GitHub's rate limit")
+            return
+        except Exception as e:
+            print(f"⚠️ Write-behind flush failed for {path}, will retry: {e}")
+
 # =====================================================
 # SETTINGS HELPERS
 # =====================================================
@@ -234,13 +514,20 @@ def _merge_nested(default: Dict[str, Any], incoming: Any) -> Dict[str, Any]:
         merged.update(incoming)
     return merged
 
+@lru_cache(maxsize=256)
+def is_hhmm(value: str) -> bool:
+    return HHMM_REGEX.fullmatch(value) is not None
+
 def _normalize_hhmm(value: Any, fallback: str) -> str:
     s = str(value).strip()
-    try:
-        datetime.strptime(s, "%H:%M")
-        return s
-    except Exception:
-        return fallback
+    return s if is_hhmm(s) else fallback
+
+@lru_cache(maxsize=256)
+def parse_hhmm(value: str) -> Tuple[int, int]:
+    """"HH:MM" -> (hour, minute). Schedule times are already normalised, so
+    there are only a handful of distinct values; memoised for the scheduler."""
+    hh, mm = value.split(":", 1)
+    return int(hh), int(mm)
 
 def _normalize_guild_settings(raw: Any) -> Dict[str, Any]:
     """
@@ -290,9 +577,50 @@ def _normalize_guild_settings(raw: Any) -> Dict[str, Any]:
 
     return merged
 
-def load_all_settings() -> Tuple[Dict[str, Any], Optional[str]]:
+# The scheduler reads settings every minute and on_message / most slash
+# commands read them too. Most changes come from this process's own saves
+# (save_all_settings refreshes the copy), but admins also edit the file by
+# hand in the data repo. So keep the last normalised copy (and its sha)
+# for a short TTL, then revalidate, and a hand edit shows up within
+# SETTINGS_CACHE_TTL without re-downloading the file on every read.
+# Callers get a deep copy so they can mutate freely without touching it.
+# "channels" is the set of channel ids enabled guilds listen in, so
+# on_message can drop everything else without a settings load.
+_SETTINGS_CACHE: Dict[str, Any] = {"value": None, "sha": None, "expires": 0.0, "channels": None}
+
+def _store_settings_cache(all_settings: Dict[str, Any], sha: Optional[str]) -> None:
+    _SETTINGS_CACHE["value"] = copy.deepcopy(all_settings)
+    _SETTINGS_CACHE["sha"] = sha
+    _SETTINGS_CACHE["expires"] = time.monotonic() + SETTINGS_CACHE_TTL
+    _SETTINGS_CACHE["channels"] = frozenset(
+        s["channel_id"]
+        for s in all_settings.values()
+        if s.get("enabled", True) and s.get("channel_id")
+    )
+
+def is_watched_channel(channel_id: int) -> Optional[bool]:
+    """
+    Whether any enabled guild listens in this channel, per the cached
+    settings. None once the cache has lapsed (the caller should load
+    settings properly, which refreshes it).
+    """
+    if _SETTINGS_CACHE["channels"] is None or time.monotonic() >= _SETTINGS_CACHE["expires"]:
+        return None
+    return channel_id in _SETTINGS_CACHE["channels"]
+
+async def load_all_settings() -> Tuple[Dict[str, Any], Optional[str]]:
     """Load the entire settings file. Returns {guild_id: settings_dict}, sha."""
-    raw, sha = github_load_json(SETTINGS_PATH, {})
+    if _SETTINGS_CACHE["value"] is not None and time.monotonic() < _SETTINGS_CACHE["expires"]:
+        return copy.deepcopy(_SETTINGS_CACHE["value"]), _SETTINGS_CACHE["sha"]
+
+    raw, sha = await github_load_json_async(SETTINGS_PATH, {})
+
+    # Same file version as the copy we already normalised (the usual case
+    # once the TTL lapses) — keep that copy and skip the merge.
+    if sha is not None and sha == _SETTINGS_CACHE["sha"] and _SETTINGS_CACHE["value"] is not None:
+        _SETTINGS_CACHE["expires"] = time.monotonic() + SETTINGS_CACHE_TTL
+        return copy.deepcopy(_SETTINGS_CACHE["value"]), sha
+
     if not isinstance(raw, dict):
         raw = {}
 
@@ -300,47 +628,88 @@ def load_all_settings() -> Tuple[Dict[str, Any], Optional[str]]:
     for guild_id, guild_raw in raw.items():
         normalised[str(guild_id)] = _normalize_guild_settings(guild_raw)
 
+    _store_settings_cache(normalised, sha)
     return normalised, sha
 
-def load_guild_settings(guild_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+async def load_guild_settings(guild_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
     """Load settings for a single guild. Also returns the full-file sha for saving."""
-    all_settings, sha = load_all_settings()
-    return all_settings.get(str(guild_id), _normalize_guild_settings({})), sha
+    all_settings, sha = await load_all_settings()
+    # `or`, not a .get() default — don't build a throwaway default settings
+    # dict on every call for guilds that already have settings.
+    return all_settings.get(str(guild_id)) or _normalize_guild_settings({}), sha
 
-def save_all_settings(all_settings: Dict[str, Any], sha: Optional[str], message: str) -> Optional[str]:
-    return github_save_json(SETTINGS_PATH, all_settings, sha, message)
+async def save_all_settings(all_settings: Dict[str, Any], sha: Optional[str], message: str, deferred: bool = False) -> Optional[str]:
+    """
+    deferred=True queues the write for the write-behind flush instead of
+    committing now. Caller holds data_lock(SETTINGS_PATH) from its load until this returns.
+    """
+    if deferred:
+        queue_github_save(SETTINGS_PATH, all_settings, sha, message)
+        new_sha = sha
+    else:
+        new_sha = await github_save_json_async(SETTINGS_PATH, all_settings, sha, message)
+    _SCHEDULE_STATE["next_check"] = 0.0
+    _store_settings_cache(
+        {str(gid): _normalize_guild_settings(s) for gid, s in all_settings.items()},
+        new_sha,
+    )
+    return new_sha
 
-def save_guild_settings(guild_id: str, guild_settings: Dict[str, Any], message: str) -> None:
-    """Load full file, update one guild's block, save back."""
-    all_settings, sha = load_all_settings()
+async def save_guild_settings(guild_id: str, guild_settings: Dict[str, Any], message: str, deferred: bool = False) -> None:
+    """Load full file, update one guild's block, save back. Caller holds data_lock(SETTINGS_PATH)."""
+    all_settings, sha = await load_all_settings()
     all_settings[str(guild_id)] = guild_settings
-    save_all_settings(all_settings, sha, message)
+    await save_all_settings(all_settings, sha, message, deferred)
 
 # =====================================================
 # TIMEZONE HELPER
 # =====================================================
+UTC = ZoneInfo("UTC")
+DEFAULT_TZ = ZoneInfo("Europe/London")
+
 def get_guild_tz(settings: Dict[str, Any]) -> ZoneInfo:
     try:
         return ZoneInfo(settings.get("timezone", "Europe/London"))
     except Exception:
-        return ZoneInfo("Europe/London")
+        return DEFAULT_TZ
+
+@lru_cache(maxsize=1)
+def sorted_timezones() -> List[str]:
+    # available_timezones() walks the tzdata directory on every call; the
+    # /settimezone autocomplete would otherwise do that on each keystroke.
+    return sorted(available_timezones())
 
 # =====================================================
 # DATE / DISPLAY HELPERS
 # =====================================================
 def today_key(dt: Optional[datetime] = None, tz: Optional[ZoneInfo] = None) -> str:
     if dt is None:
-        dt = datetime.now(tz or ZoneInfo("Europe/London"))
+        dt = datetime.now(tz or DEFAULT_TZ)
     return dt.date().isoformat()
 
+# Date keys are always "YYYY-MM-DD" and the same few dozen keys get parsed
+# over and over (every streak, leaderboard and cleanup pass walks them), so
+# parse with the C-level date.fromisoformat and memoise. strptime does
+# format/locale work on every call.
+@lru_cache(maxsize=4096)
+def parse_date_key(date_key: str) -> date:
+    return date.fromisoformat(date_key)
+
+@lru_cache(maxsize=1024)
 def pretty_day(date_key: str) -> str:
-    return datetime.strptime(date_key, "%Y-%m-%d").strftime("%A %d %B")
+    return parse_date_key(date_key).strftime("%A %d %B")
+
+@lru_cache(maxsize=1024)
+def short_day(date_key: str) -> str:
+    return parse_date_key(date_key).strftime("%d %b %Y")
 
+@lru_cache(maxsize=64)
 def week_range(today: date) -> Tuple[date, date]:
     monday = today - timedelta(days=today.weekday())
     sunday = monday + timedelta(days=6)
     return monday, sunday
 
+@lru_cache(maxsize=64)
 def month_range(today: date) -> Tuple[date, date]:
     first = today.replace(day=1)
     last_day = calendar.monthrange(today.year, today.month)[1]
@@ -362,58 +731,101 @@ def yn(v: bool) -> str:
 
 def _safe_date(dkey: str) -> Optional[date]:
     try:
-        return datetime.strptime(dkey, "%Y-%m-%d").date()
+        return parse_date_key(dkey)
     except Exception:
         return None
 
+def _score_of(entry: Any, default: Optional[int] = None) -> Optional[int]:
+    """
+    Score stored in a {score: int, ...} entry, or None if it's unusable.
+    on_message always writes ints, so that's a type check; only old or
+    hand-edited entries (numeric strings) fall through to int().
+    """
+    if type(entry) is not dict:
+        return None
+    sc = entry.get("score", default)
+    if type(sc) is int:
+        return sc
+    try:
+        return int(sc)
+    except (TypeError, ValueError):
+        return None
+
+# Memoised compute_period_rows results, keyed by
+# (guild_id, scores revision, start_d, end_d). The revision identifies the
+# exact scores contents (deferred saves included, which the sha doesn't
+# cover), so the weekly roundup, rivalry alert, leaderboards and /mymaptap
+# can share one aggregation until the scores change.
+_PERIOD_CACHE: Dict[Tuple[str, int, Optional[date], Optional[date]], Dict[str, Dict[str, int]]] = {}
+_PERIOD_CACHE_MAX = 256
+
 def compute_period_rows(
     guild_scores: Dict[str, Any],
     start_d: Optional[date],
     end_d: Optional[date],
+    cache_key: Optional[Tuple[str, int]] = None,
 ) -> Dict[str, Dict[str, int]]:
     """
     guild_scores is the scores dict for ONE guild: {date_key: {uid: {score: int}}}
     Returns {uid: {'total': int, 'days': int}}
+
+    Pass cache_key=(guild_id, data_revision(SCORES_PATH)), with the revision
+    read before load_guild_scores, when guild_scores is unmodified from that
+    load to reuse a previous result. The returned dict is
+    shared in that case, so treat it as read-only.
     """
-    totals: Dict[str, Dict[str, int]] = {}
+    if cache_key is not None:
+        key = (str(cache_key[0]), cache_key[1], start_d, end_d)
+        cached = _PERIOD_CACHE.get(key)
+        if cached is None:
+            if len(_PERIOD_CACHE) >= _PERIOD_CACHE_MAX:
+                _PERIOD_CACHE.clear()
+            cached = _PERIOD_CACHE[key] = compute_period_rows(guild_scores, start_d, end_d)
+        return cached
 
     if not isinstance(guild_scores, dict):
-        return totals
+        return {}
+
+    # Two flat counters in the loop (C-level `+=` on missing keys) instead
+    # of a setdefault + two nested lookups per score row.
+    points: Counter = Counter()
+    days: Counter = Counter()
+
+    # Date keys are "YYYY-MM-DD", which sort the same as the dates they
+    # name, so range-check with plain string comparisons and only parse
+    # (to reject malformed keys) what's inside the range.
+    start_iso = start_d.isoformat() if start_d else None
+    end_iso = end_d.isoformat() if end_d else None
 
     for dkey, bucket in guild_scores.items():
-        d = _safe_date(dkey)
-        if not d:
+        if start_iso and dkey < start_iso:
             continue
-        if start_d and d < start_d:
+        if end_iso and dkey > end_iso:
             continue
-        if end_d and d > end_d:
-            continue
-        if not isinstance(bucket, dict):
+        if not isinstance(bucket, dict) or not _safe_date(dkey):
             continue
 
         for uid, entry in bucket.items():
-            try:
-                sc = int(entry.get("score", 0))
-            except Exception:
+            sc = _score_of(entry, 0)
+            if sc is None:
                 continue
 
-            totals.setdefault(uid, {"total": 0, "days": 0})
-            totals[uid]["total"] += sc
-            totals[uid]["days"] += 1
+            points[uid] += sc
+            days[uid] += 1
 
-    return totals
+    return {uid: {"total": total, "days": days[uid]} for uid, total in points.items()}
 
 
 # =====================================================
 # GUILD-SCOPED DATA HELPERS
 # =====================================================
-def load_guild_scores(guild_id: str) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[str]]:
+async def load_guild_scores(guild_id: str) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[str]]:
     """
     Returns (all_scores, guild_scores, sha).
     guild_scores is the slice for this guild only.
     You need all_scores + sha to write back.
     """
-    all_scores, sha = github_load_json(SCORES_PATH, {})
+    all_scores, sha = await github_load_json_async(SCORES_PATH, {}, DATA_CACHE_TTL)
     if not isinstance(all_scores, dict):
         all_scores = {}
     guild_scores = all_scores.get(str(guild_id), {})
@@ -421,15 +833,22 @@ def load_guild_scores(guild_id: str) -> Tuple[Dict[str, Any], Dict[str, Any], Op
         guild_scores = {}
     return all_scores, guild_scores, sha
 
-def save_guild_scores(guild_id: str, all_scores: Dict[str, Any], guild_scores: Dict[str, Any], sha: Optional[str], message: str) -> Optional[str]:
+async def save_guild_scores(guild_id: str, all_scores: Dict[str, Any], guild_scores: Dict[str, Any], sha: Optional[str], message: str, deferred: bool = False) -> Optional[str]:
+    """
+    deferred=True queues the write for the write-behind flush instead of
+    committing now. Caller holds data_lock(SCORES_PATH) from its load until this returns.
+    """
     all_scores[str(guild_id)] = guild_scores
-    return github_save_json(SCORES_PATH, all_scores, sha, message)
+    if deferred:
+        queue_github_save(SCORES_PATH, all_scores, sha, message)
+        return sha
+    return await github_save_json_async(SCORES_PATH, all_scores, sha, message)
 
-def load_guild_users(guild_id: str) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[str]]:
+async def load_guild_users(guild_id: str) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[str]]:
     """
     Returns (all_users, guild_users, sha).
     """
-    all_users, sha = github_load_json(USERS_PATH, {})
+    all_users, sha = await github_load_json_async(USERS_PATH, {}, DATA_CACHE_TTL)
     if not isinstance(all_users, dict):
         all_users = {}
     guild_users = all_users.get(str(guild_id), {})
@@ -437,25 +856,52 @@ def load_guild_users(guild_id: str) -> Tuple[Dict[str, Any], Dict[str, Any], Opt
         guild_users = {}
     return all_users, guild_users, sha
 
-def save_guild_users(guild_id: str, all_users: Dict[str, Any], guild_users: Dict[str, Any], sha: Optional[str], message: str) -> Optional[str]:
+async def save_guild_users(guild_id: str, all_users: Dict[str, Any], guild_users: Dict[str, Any], sha: Optional[str], message: str, deferred: bool = False) -> Optional[str]:
+    """
+    deferred=True queues the write for the write-behind flush instead of
+    committing now. Caller holds data_lock(USERS_PATH) from its load until this returns.
+    """
     all_users[str(guild_id)] = guild_users
-    return github_save_json(USERS_PATH, all_users, sha, message)
+    if deferred:
+        queue_github_save(USERS_PATH, all_users, sha, message)
+        return sha
+    return await github_save_json_async(USERS_PATH, all_users, sha, message)
+
+async def warm_data_caches():
+    """
+    Fetch every data file once at startup, concurrently. The first messages
+    and scheduled posts then only revalidate (a 304 with no body to parse)
+    instead of each paying for a full download.
+    """
+    results = await asyncio.gather(
+        load_all_settings(),
+        github_load_json_async(SCORES_PATH, {}),
+        github_load_json_async(USERS_PATH, {}),
+        github_load_json_async(MILES_PATH, {}),
+        return_exceptions=True,
+    )
+    failed = [r for r in results if isinstance(r, Exception)]
+    for e in failed:
+        print(f"⚠️ Cache warm-up failed: {e}")
+    if not failed:
+        print("✅ Data caches warmed")
 
 # =====================================================
 # MILES HELPERS (global currency)
 # =====================================================
-def load_miles() -> Tuple[Dict[str, Any], Optional[str]]:
+async def load_miles() -> Tuple[Dict[str, Any], Optional[str]]:
     """Returns {uid: {'miles': int, 'voted_at': isostr|None}}, sha."""
-    data, sha = github_load_json(MILES_PATH, {})
+    data, sha = await github_load_json_async(MILES_PATH, {})
     if not isinstance(data, dict):
         data = {}
     return data, sha
 
-def save_miles(data: Dict[str, Any], sha: Optional[str], message: str) -> Optional[str]:
-    return github_save_json(MILES_PATH, data, sha, message)
+async def save_miles(data: Dict[str, Any], sha: Optional[str], message: str) -> Optional[str]:
+    """Caller holds data_lock(MILES_PATH) from its load until this returns."""
+    return await github_save_json_async(MILES_PATH, data, sha, message)
 
-def get_user_miles(uid: str) -> int:
-    data, _ = load_miles()
+async def get_user_miles(uid: str) -> int:
+    data, _ = await load_miles()
     return int(data.get(uid, {}).get("miles", 0))
 
 def _default_miles_entry() -> Dict[str, Any]:
@@ -477,34 +923,72 @@ def default_user_stats() -> Dict[str, Any]:
 # STREAK / RANK HELPERS
 # =====================================================
 def calculate_current_streak(guild_scores: Dict[str, Any], user_id: str, tz: ZoneInfo) -> int:
-    played: List[date] = []
-    for dkey, bucket in guild_scores.items():
-        if isinstance(bucket, dict) and user_id in bucket:
-            d = _safe_date(dkey)
-            if d:
-                played.append(d)
+    # Walk backwards from today probing the date keys directly, so a streak
+    # of K days costs ~K dict lookups instead of parsing every stored day.
+    def played(d: date) -> bool:
+        bucket = guild_scores.get(d.isoformat())
+        return isinstance(bucket, dict) and user_id in bucket
 
-    if not played:
-        return 0
-
-    played_set = set(played)
     today = datetime.now(tz).date()
-    yesterday = today - timedelta(days=1)
+    d = today if played(today) else today - timedelta(days=1)
 
-    if today not in played_set and yesterday not in played_set:
-        return 0
-
-    d = today if today in played_set else yesterday
     streak = 0
-    while d in played_set:
+    while played(d):
         streak += 1
         d -= timedelta(days=1)
     return streak
 
+def user_current_streak(stats: Dict[str, Any], guild_scores: Dict[str, Any], user_id: str, tz: ZoneInfo) -> int:
+    """
+    Same result as calculate_current_streak, but reads the current_streak /
+    last_played fields written at ingest time instead of walking the streak.
+    Those are only trusted when last_played is the user's latest day
+    (today or yesterday) in guild_scores, so anything that touched scores
+    without updating users (e.g. /redeem) falls back to the full walk.
+    """
+    today = datetime.now(tz).date()
+    today_str = today.isoformat()
+    yesterday_str = (today - timedelta(days=1)).isoformat()
+
+    if user_id in guild_scores.get(today_str, {}):
+        latest = today_str
+    elif user_id in guild_scores.get(yesterday_str, {}):
+        latest = yesterday_str
+    else:
+        return 0
+
+    stored = stats.get("current_streak")
+    if stats.get("last_played") == latest and isinstance(stored, int):
+        return stored
+    return calculate_current_streak(guild_scores, user_id, tz)
+
 def eligible_users(guild_users: Dict[str, Any]) -> Dict[str, Any]:
     return {uid: u for uid, u in guild_users.items() if int(u.get("days_played", 0)) > 0}
 
-def calculate_all_time_rank(guild_users: Dict[str, Any], user_id: str) -> Tuple[int, int]:
+# All-time rank positions {uid: rank} plus player count, keyed by
+# (guild_id, users revision) like _PERIOD_CACHE.
+_RANK_CACHE: Dict[Tuple[str, int], Tuple[Dict[str, int], int]] = {}
+_RANK_CACHE_MAX = 64
+
+def calculate_all_time_rank(
+    guild_users: Dict[str, Any],
+    user_id: str,
+    cache_key: Optional[Tuple[str, int]] = None,
+) -> Tuple[int, int]:
+    if cache_key is not None:
+        key = (str(cache_key[0]), cache_key[1])
+        cached = _RANK_CACHE.get(key)
+        if cached is None:
+            if len(_RANK_CACHE) >= _RANK_CACHE_MAX:
+                _RANK_CACHE.clear()
+            cached = _RANK_CACHE[key] = _all_time_rank_positions(guild_users)
+        positions, total = cached
+        return positions.get(user_id, total), total
+
+    positions, total = _all_time_rank_positions(guild_users)
+    return positions.get(user_id, total), total
+
+def _all_time_rank_positions(guild_users: Dict[str, Any]) -> Tuple[Dict[str, int], int]:
     elig = eligible_users(guild_users)
     rows: List[Tuple[str, float]] = []
     for uid, u in elig.items():
@@ -514,27 +998,24 @@ def calculate_all_time_rank(guild_users: Dict[str, Any], user_id: str) -> Tuple[
         except Exception:
             pass
 
-    rows.sort(key=lambda x: x[1], reverse=True)
-    for i, (uid, _) in enumerate(rows, start=1):
-        if uid == user_id:
-            return i, len(rows)
-
-    return len(rows), len(rows)
+    rows.sort(key=itemgetter(1), reverse=True)
+    return {uid: i for i, (uid, _) in enumerate(rows, start=1)}, len(rows)
 
 def calculate_period_rank(
     guild_scores: Dict[str, Any],
     user_id: str,
     start_d: date,
     end_d: date,
+    cache_key: Optional[Tuple[str, int]] = None,
 ) -> Tuple[Optional[int], int]:
-    totals = compute_period_rows(guild_scores, start_d, end_d)
+    totals = compute_period_rows(guild_scores, start_d, end_d, cache_key)
 
     rows = [
         (uid, round(v["total"] / v["days"]))
         for uid, v in totals.items()
         if v["days"] > 0
     ]
-    rows.sort(key=lambda x: x[1], reverse=True)
+    rows.sort(key=itemgetter(1), reverse=True)
 
     for i, (uid, _) in enumerate(rows, start=1):
         if uid == user_id:
@@ -542,19 +1023,32 @@ def calculate_period_rank(
 
     return None, len(rows)
 
-def calculate_global_rank(user_id: str) -> Tuple[Optional[int], int]:
+# Global rank positions for the users file, keyed by its revision like
+# _RANK_CACHE. Only one file is ever ranked, so this holds a single entry.
+_GLOBAL_RANK_CACHE: Dict[int, Tuple[Dict[str, int], int]] = {}
+
+async def calculate_global_rank(user_id: str) -> Tuple[Optional[int], int]:
     """
     Flattens all guilds in users.json, deduplicates by user ID
     (a user in multiple servers gets their scores averaged across guilds),
     and returns (rank, total_players) for the given user_id.
     Ranked by average score across all appearances.
     """
-    all_users, _ = github_load_json(USERS_PATH, {})
+    revision = data_revision(USERS_PATH)
+    all_users, _ = await github_load_json_async(USERS_PATH, {}, DATA_CACHE_TTL)
     if not isinstance(all_users, dict):
         return None, 0
 
+    cached = _GLOBAL_RANK_CACHE.get(revision)
+    if cached is None:
+        _GLOBAL_RANK_CACHE.clear()
+        cached = _GLOBAL_RANK_CACHE[revision] = _global_rank_positions(all_users)
+    positions, total = cached
+    return positions.get(user_id), total
+
+def _global_rank_positions(all_users: Dict[str, Any]) -> Tuple[Dict[str, int], int]:
     # {uid: [avg_score, avg_score, ...]} — one entry per guild they appear in
-    global_avgs: Dict[str, List[float]] = {}
+    global_avgs: Dict[str, List[float]] = defaultdict(list)
 
     for guild_id, guild_users in all_users.items():
         if not isinstance(guild_users, dict):
@@ -565,25 +1059,17 @@ def calculate_global_rank(user_id: str) -> Tuple[Optional[int], int]:
                 if days < 5:
                     continue
                 avg = float(stats["total_points"]) / float(days)
-                global_avgs.setdefault(uid, []).append(avg)
+                global_avgs[uid].append(avg)
             except Exception:
                 continue
 
-    if not global_avgs:
-        return None, 0
-
     # Final score = mean of their per-guild averages
     rows: List[Tuple[str, float]] = [
         (uid, sum(avgs) / len(avgs))
         for uid, avgs in global_avgs.items()
     ]
-    rows.sort(key=lambda x: x[1], reverse=True)
-
-    for i, (uid, _) in enumerate(rows, start=1):
-        if uid == user_id:
-            return i, len(rows)
-
-    return None, len(rows)
+    rows.sort(key=itemgetter(1), reverse=True)
+    return {uid: i for i, (uid, _) in enumerate(rows, start=1)}, len(rows)
 
 # =====================================================
 # SERVERSTREAKHELPER
@@ -636,47 +1122,66 @@ def calculate_server_streaks(guild_scores: Dict[str, Any], tz: ZoneInfo) -> Tupl
     return current, best, last_score_date
 
 
-def initialise_all_server_streaks() -> Tuple[int, int]:
-    all_settings, settings_sha = load_all_settings()
-    all_scores, _ = github_load_json(SCORES_PATH, {})
-    if not isinstance(all_scores, dict):
-        all_scores = {}
+async def initialise_all_server_streaks() -> Tuple[int, int]:
+    async with data_lock(SETTINGS_PATH):
+        (all_settings, settings_sha), (all_scores, _) = await asyncio.gather(
+            load_all_settings(),
+            github_load_json_async(SCORES_PATH, {}),
+        )
+        if not isinstance(all_scores, dict):
+            all_scores = {}
 
-    updated = 0
-    total = 0
+        updated = 0
+        total = 0
 
-    for guild_id, settings in all_settings.items():
-        total += 1
-        guild_scores = all_scores.get(str(guild_id), {})
-        if not isinstance(guild_scores, dict):
-            guild_scores = {}
+        for guild_id, settings in all_settings.items():
+            total += 1
+            guild_scores = all_scores.get(str(guild_id), {})
+            if not isinstance(guild_scores, dict):
+                guild_scores = {}
 
-        tz = get_guild_tz(settings)
-        current, best, last_score_date = calculate_server_streaks(guild_scores, tz)
+            tz = get_guild_tz(settings)
+            current, best, last_score_date = calculate_server_streaks(guild_scores, tz)
 
-        settings["server_streak"] = {
-            "current": current,
-            "best": best,
-            "last_score_date": last_score_date
-        }
+            settings["server_streak"] = {
+                "current": current,
+                "best": best,
+                "last_score_date": last_score_date
+            }
 
-        updated += 1
+            updated += 1
 
-    save_all_settings(all_settings, settings_sha, "MapTap: initialise server streaks")
-    return updated, total
+        await save_all_settings(all_settings, settings_sha, "MapTap: initialise server streaks")
+        return updated, total
 
 
 # =====================================================
 # ROUND PARSING
 # =====================================================
 def has_zero_round(text: str) -> bool:
+    if "0" not in text:
+        return False
     for line in text.splitlines():
-        if SCORE_REGEX.search(line):
+        if _score_search(line):
             continue
-        if ROUND_ZERO_REGEX.search(line):
+        if _round_zero_search(line):
             return True
     return False
 
+# Reply templates, formatted only for the one that gets picked
+ZERO_ROAST_MSGS = [
+    "💀 {mention} dropped a **0** round",
+    "🗺️ {mention} learned nothing today",
+]
+
+DUPLICATE_MSGS = [
+    "🙄 {mention} already submitted a score today (**{existing}**). Nice try though.",
+    "😂 {mention} thought they could sneak in a better score — already got **{existing}** locked in, cheers!",
+    "🗺️ One map per day, {mention}. Your **{existing}** is already on the board.",
+    "👀 {mention} tried to update their score to **{score}** but we're keeping the **{existing}**. The first one counts!",
+    "🤡 Duplicate detected! {mention}'s **{existing}** is staying put. No score shopping here.",
+]
+
 
 # ==============
 # update topgg
@@ -702,6 +1207,11 @@ def update_topgg():
     except Exception as e:
         print("❌ Top.gg update failed:", e)
 
+async def update_topgg_async():
+    # Same reasoning as github_load_json_async: keep the blocking POST
+    # (and its retries) off the event loop.
+    await asyncio.to_thread(update_topgg)
+
 
 # =====================================================
 # DISCORD CLIENT
@@ -714,8 +1224,52 @@ class MapTapBot(discord.Client):
     def __init__(self):
         super().__init__(intents=intents)
         self.tree = app_commands.CommandTree(self)
+        self.web_runner: Optional[web.AppRunner] = None
+        self._shutdown_task: Optional[asyncio.Task] = None
+
+    async def close(self):
+        # Don't lose score posts still waiting in the write-behind queue.
+        # stop() rather than cancel(): cancelling can't interrupt a PUT
+        # already running on a worker thread, and flushing again while it's
+        # in flight would commit the same file twice. Let the current
+        # iteration finish (it flushes on its way out) and then sweep up.
+        if self.flush_pending_writes.is_running():
+            self.flush_pending_writes.stop()
+            task = self.flush_pending_writes.get_task()
+            if task is not None:
+                await asyncio.wait([task])
+        await flush_github_writes()
+
+        if self.web_runner is not None:
+            await self.web_runner.cleanup()
+            self.web_runner = None
+        await super().close()
+
+    async def start(self, *args: Any, **kwargs: Any) -> None:
+        # Bind the port before logging in: setup_hook only runs once login
+        # has succeeded, and Render's health check shouldn't have to wait for
+        # that plus the command sync.
+        if self.web_runner is None:
+            self.web_runner = await start_web()
+
+        # Render stops the service with SIGTERM, which client.run() doesn't
+        # handle, so the process would die with the write-behind queue
+        # unflushed. Route it through close() like Ctrl+C.
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except NotImplementedError:  # Windows event loops have no signal handlers
+            pass
+
+        await super().start(*args, **kwargs)
+
+    def _on_sigterm(self) -> None:
+        print("🛑 SIGTERM received, shutting down")
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self.close())
 
     async def setup_hook(self):
+        await warm_data_caches()
+
         try:
             await self.tree.sync()
             print("✅ Synced global commands")
@@ -735,6 +1289,15 @@ class MapTapBot(discord.Client):
             self.poll_topgg_votes.start()
             print("✅ poll_topgg_votes started in setup_hook()")
 
+        if not self.flush_pending_writes.is_running():
+            self.flush_pending_writes.start()
+            print("✅ flush_pending_writes started in setup_hook()")
+
+    @tasks.loop(seconds=WRITE_BEHIND_SECONDS)
+    async def flush_pending_writes(self):
+        """Commit files queued by queue_github_save (one commit per dirty file)."""
+        await flush_github_writes()
+
     @tasks.loop(minutes=2)
     async def poll_topgg_votes(self):
         """Poll top.gg every 2 minutes to credit Miles to users who have voted."""
@@ -742,13 +1305,14 @@ class MapTapBot(discord.Client):
             return
 
         try:
-            miles_data, miles_sha = load_miles()
+            miles_data, _ = await load_miles()
         except requests.exceptions.RequestException as e:
             print(f"⚠️ poll_topgg_votes: could not load miles data, skipping this cycle: {e}")
             return
 
-        changed = False
-        now = datetime.now(ZoneInfo("UTC"))
+        now = datetime.now(UTC)
+        # {uid: whether top.gg says they've voted}, for everyone polled this run
+        polled: Dict[str, bool] = {}
 
         for uid, entry in list(miles_data.items()):
             last_polled = entry.get("last_polled_vote")
@@ -762,7 +1326,8 @@ class MapTapBot(discord.Client):
                     pass
 
             try:
-                r = SESSION.get(
+                r = await asyncio.to_thread(
+                    SESSION.get,
                     f"https://top.gg/api/bots/{client.user.id}/check",
                     headers={"Authorization": TOPGG_TOKEN},
                     params={"userId": uid},
@@ -770,8 +1335,31 @@ class MapTapBot(discord.Client):
                 )
                 if r.status_code != 200:
                     continue
-                voted = r.json().get("voted", 0)
-                if voted == 1:
+                polled[uid] = r.json().get("voted", 0) == 1
+            except Exception:
+                continue
+
+        # Nothing gets saved unless someone is credited.
+        if not any(polled.values()):
+            return
+
+        # The polling above can take minutes, so it runs without the miles
+        # lock (/vote, /redeem and /givemiles would otherwise miss their
+        # interaction deadline behind it). Apply the results to a fresh copy
+        # under the lock, the same way scheduler_tick writes last_run.
+        async with data_lock(MILES_PATH):
+            try:
+                miles_data, miles_sha = await load_miles()
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ poll_topgg_votes: could not load miles data, skipping this cycle: {e}")
+                return
+
+            changed = False
+            for uid, voted in polled.items():
+                entry = miles_data.get(uid)
+                if not isinstance(entry, dict):
+                    continue
+                if voted:
                     voted_at = entry.get("voted_at")
                     already_credited = False
                     if voted_at:
@@ -786,17 +1374,13 @@ class MapTapBot(discord.Client):
                         entry["voted_at"] = now.isoformat()
                         changed = True
                 entry["last_polled_vote"] = now.isoformat()
-                miles_data[uid] = entry
-            except Exception:
-                continue
 
-        if changed:
-            try:
-                save_miles(miles_data, miles_sha, "MapTap: credit miles for votes")
-            except requests.exceptions.RequestException as e:
-                print(f"⚠️ poll_topgg_votes: failed to save miles data: {e}")
+            if changed:
+                try:
+                    await save_miles(miles_data, miles_sha, "MapTap: credit miles for votes")
+                except requests.exceptions.RequestException as e:
+                    print(f"⚠️ poll_topgg_votes: failed to save miles data: {e}")
 
-        
     @tasks.loop(minutes=1)
     async def scheduler_tick(self):
         """
@@ -804,7 +1388,7 @@ class MapTapBot(discord.Client):
         checks whether any scheduled action is due for that guild's local time,
         fires if so, then saves the updated last_run block back in one write.
 
-        NOTE: we treat a scheduled time as "due" once now_hm >= scheduled_hm
+        NOTE: we treat a scheduled time as "due" once (hour, minute) >= scheduled
         (rather than requiring an exact match). The 1-minute loop can drift or
         occasionally skip a minute — e.g. while this tick is blocked on a slow
         GitHub call — and an exact-equality check would then miss that day's
@@ -821,8 +1405,11 @@ class MapTapBot(discord.Client):
         so a single bad guild or a single GitHub hiccup can't silently kill
         every future daily post / scoreboard / etc.
         """
+        if time.time() < _SCHEDULE_STATE["next_check"]:
+            return
+
         try:
-            all_settings, sha = load_all_settings()
+            all_settings, sha = await load_all_settings()
         except requests.exceptions.RequestException as e:
             print(f"⚠️ scheduler_tick: could not load settings, skipping this cycle: {e}")
             return
@@ -830,7 +1417,8 @@ class MapTapBot(discord.Client):
             print(f"⚠️ scheduler_tick: unexpected error loading settings, skipping this cycle: {e}")
             return
 
-        fired_any = False
+        # {guild_id: {job field: date}} for the jobs run this tick
+        ran: Dict[str, Dict[str, str]] = {}
 
         for guild_id, settings in all_settings.items():
             if not settings.get("enabled", True):
@@ -838,85 +1426,55 @@ class MapTapBot(discord.Client):
 
             tz = get_guild_tz(settings)
             now = datetime.now(tz)
-            now_hm = now.strftime("%H:%M")
+            now_hm = (now.hour, now.minute)
             today = today_key(now, tz)
 
             times = settings.get("times", {})
             last_run = settings.get("last_run", {})
             alerts = settings.get("alerts", {})
 
-            def is_due(field: str) -> bool:
+            for field, alert_key, day_check, job, name in SCHEDULED_JOBS:
+                if not alerts.get(alert_key, True):
+                    continue
+                if day_check is not None and not day_check(now):
+                    continue
                 scheduled = times.get(field)
-                return bool(scheduled) and now_hm >= scheduled and last_run.get(field) != today
-
-            guild_fired = False
-
-            # Daily Post
-            if alerts.get("daily_post_enabled", True) and is_due("daily_post"):
-                try:
-                    await do_daily_post(guild_id, settings)
-                except Exception as e:
-                    print(f"⚠️ daily_post failed for guild {guild_id}: {e}")
-                finally:
-                    all_settings[guild_id]["last_run"]["daily_post"] = today
-                    guild_fired = True
-
-            # Daily Scoreboard
-            if alerts.get("daily_scoreboard_enabled", True) and is_due("daily_scoreboard"):
-                try:
-                    await do_daily_scoreboard(guild_id, settings)
-                except Exception as e:
-                    print(f"⚠️ daily_scoreboard failed for guild {guild_id}: {e}")
-                finally:
-                    all_settings[guild_id]["last_run"]["daily_scoreboard"] = today
-                    guild_fired = True
-
-            # Weekly Roundup (Sundays in the guild's local time)
-            if (
-                alerts.get("weekly_roundup_enabled", True)
-                and now.weekday() == 6
-                and is_due("weekly_roundup")
-            ):
-                try:
-                    await do_weekly_roundup(guild_id, settings)
-                except Exception as e:
-                    print(f"⚠️ weekly_roundup failed for guild {guild_id}: {e}")
-                finally:
-                    all_settings[guild_id]["last_run"]["weekly_roundup"] = today
-                    guild_fired = True
+                if not scheduled or now_hm < parse_hhmm(scheduled) or last_run.get(field) == today:
+                    continue
 
-            # Rivalry Alert
-            if alerts.get("rivalry_enabled", True) and is_due("rivalry"):
-                try:
-                    await do_rivalry_alert(guild_id, settings)
-                except Exception as e:
-                    print(f"⚠️ rivalry_alert failed for guild {guild_id}: {e}")
-                finally:
-                    all_settings[guild_id]["last_run"]["rivalry"] = today
-                    guild_fired = True
-
-            # Monthly Leaderboard (1st of month in guild's local time)
-            if (
-                alerts.get("monthly_leaderboard_enabled", True)
-                and now.day == 1
-                and is_due("monthly_leaderboard")
-            ):
                 try:
-                    await do_monthly_leaderboard(guild_id, settings)
+                    await job(guild_id, settings)
                 except Exception as e:
-                    print(f"⚠️ monthly_leaderboard failed for guild {guild_id}: {e}")
+                    print(f"⚠️ {name} failed for guild {guild_id}: {e}")
                 finally:
-                    all_settings[guild_id]["last_run"]["monthly_leaderboard"] = today
-                    guild_fired = True
-
-            if guild_fired:
-                fired_any = True
-
-        if fired_any:
+                    last_run[field] = today
+                    ran.setdefault(guild_id, {})[field] = today
+
+        if ran:
+            # The jobs above can take a while and settings may have been
+            # saved meanwhile (server streak, /maptapsettings), so apply the
+            # last_run marks to a fresh copy under the lock rather than
+            # saving the copy loaded at the top of the tick.
             try:
-                save_all_settings(all_settings, sha, f"MapTap: last_run update")
+                async with data_lock(SETTINGS_PATH):
+                    all_settings, sha = await load_all_settings()
+                    for guild_id, fields in ran.items():
+                        if guild_id in all_settings:
+                            all_settings[guild_id].setdefault("last_run", {}).update(fields)
+                    await save_all_settings(all_settings, sha, "MapTap: last_run update")
             except Exception as e:
                 print("⚠️ Failed to save last_run:", e)
+                return
+
+        _SCHEDULE_STATE["next_check"] = next_schedule_check(all_settings)
+
+    @scheduler_tick.before_loop
+    async def before_scheduler_tick(self):
+        # Channels aren't cached until ready (jobs would find no channel and
+        # still be marked as run), and starting on a minute boundary keeps
+        # each tick right at HH:MM:00 instead of wherever startup left it.
+        await self.wait_until_ready()
+        await asyncio.sleep(60 - datetime.now().second)
 
     @scheduler_tick.error
     async def scheduler_tick_error(self, error: BaseException):
@@ -941,13 +1499,21 @@ class MapTapBot(discord.Client):
             self.poll_topgg_votes.start()
             print("✅ poll_topgg_votes restarted after error")
 
+    @flush_pending_writes.error
+    async def flush_pending_writes_error(self, error: BaseException):
+        """Same safety net again — a dead flusher would silently stop saving scores."""
+        print(f"⚠️ flush_pending_writes crashed unexpectedly: {error!r}")
+        if not self.flush_pending_writes.is_running():
+            self.flush_pending_writes.start()
+            print("✅ flush_pending_writes restarted after error")
+
 client = MapTapBot()
 
 @client.event
 async def on_ready():
     print(f"✅ Logged in as {client.user} (MapTap)")
 
-    update_topgg()
+    await update_topgg_async()
 
     try:
         if not client.scheduler_tick.is_running():
@@ -956,6 +1522,9 @@ async def on_ready():
         if not client.poll_topgg_votes.is_running():
             client.poll_topgg_votes.start()
             print("✅ poll_topgg_votes started from on_ready() fallback")
+        if not client.flush_pending_writes.is_running():
+            client.flush_pending_writes.start()
+            print("✅ flush_pending_writes started from on_ready() fallback")
     except Exception as e:
         print("❌ Failed to start tasks in on_ready:", e)
 
@@ -968,7 +1537,8 @@ def has_admin_access(member: discord.Member, settings: Dict[str, Any]) -> bool:
     allowed = settings.get("admin_role_ids", [])
     if not allowed:
         return False
-    return any(r.id in allowed for r in member.roles)
+    # Hash lookups instead of scanning the role-id list for every member role.
+    return not set(allowed).isdisjoint(r.id for r in member.roles)
 
 def get_configured_channel(settings: Dict[str, Any]) -> Optional[discord.TextChannel]:
     cid = settings.get("channel_id")
@@ -989,6 +1559,30 @@ async def react_safe(msg: discord.Message, emoji: str, fallback: str = "✅"):
         except Exception:
             pass
 
+async def react_all(msg: discord.Message, reactions: List[Tuple[str, str]]):
+    """react_safe each (emoji, fallback) in order, so they show up in that order."""
+    for emoji, fallback in reactions:
+        await react_safe(msg, emoji, fallback)
+
+# Strong references to fire-and-forget tasks; the loop only keeps weak ones.
+_BACKGROUND_TASKS: set = set()
+
+def spawn(coro: Awaitable[Any]) -> "asyncio.Task[Any]":
+    task = asyncio.ensure_future(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return task
+
+async def bounded_gather(*aws, limit: int = 4) -> List[Any]:
+    """asyncio.gather, but with at most `limit` awaitables in flight at once."""
+    sem = asyncio.Semaphore(limit)
+
+    async def _run(aw):
+        async with sem:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws))
+
 # =====================================================
 # SETTINGS UI
 # =====================================================
@@ -1053,9 +1647,7 @@ class TimeSettingsModal(discord.ui.Modal, title="MapTap Times"):
         }
 
         for k, v in values.items():
-            try:
-                datetime.strptime(v, "%H:%M")
-            except Exception:
+            if not is_hhmm(v):
                 await interaction.response.send_message(
                     f"❌ Invalid time for **{k}**. Use HH:MM (24h), e.g. 23:30",
                     ephemeral=True,
@@ -1065,12 +1657,40 @@ class TimeSettingsModal(discord.ui.Modal, title="MapTap Times"):
         self.settings_view.settings["times"] = values
         await self.settings_view.save_and_refresh(interaction, "MapTap: update times")
 
+# (alert key, button label) for each toggle in the alerts view, in display order
+ALERT_TOGGLES: List[Tuple[str, str]] = [
+    ("daily_post_enabled", "Daily post"),
+    ("daily_scoreboard_enabled", "Daily scoreboard"),
+    ("weekly_roundup_enabled", "Weekly roundup"),
+    ("rivalry_enabled", "Rivalry alerts"),
+    ("monthly_leaderboard_enabled", "Monthly leaderboard"),
+    ("zero_score_roasts_enabled", "Zero-score roasts"),
+    ("pb_messages_enabled", "Personal best messages"),
+    ("perfect_score_enabled", "Perfect score messages"),
+]
+
+class AlertToggleButton(discord.ui.Button):
+    def __init__(self, parent: "ConfigureAlertsView", key: str, label: str):
+        self.parent_view = parent
+        self.key = key
+        super().__init__(label=label, style=discord.ButtonStyle.secondary)
+
+    async def callback(self, interaction: discord.Interaction):
+        self.parent_view.toggle(self.key)
+        await self.parent_view._ack(interaction)
+
 class ConfigureAlertsView(discord.ui.View):
     def __init__(self, settings_view: "MapTapSettingsView"):
         super().__init__(timeout=240)
         self.settings_view = settings_view
         self.alerts = dict(settings_view.settings.get("alerts", DEFAULT_GUILD_SETTINGS["alerts"]))
 
+        for key, label in ALERT_TOGGLES:
+            self.add_item(AlertToggleButton(self, key, label))
+        # Keep Save after the toggles (decorated items are added first)
+        self.remove_item(self.save)
+        self.add_item(self.save)
+
     def toggle(self, key: str):
         self.alerts[key] = not bool(self.alerts.get(key, False))
 
@@ -1080,46 +1700,6 @@ class ConfigureAlertsView(discord.ui.View):
         except Exception:
             pass
 
-    @discord.ui.button(label="Daily post", style=discord.ButtonStyle.secondary)
-    async def daily_post(self, interaction: discord.Interaction, _):
-        self.toggle("daily_post_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Daily scoreboard", style=discord.ButtonStyle.secondary)
-    async def daily_scoreboard(self, interaction: discord.Interaction, _):
-        self.toggle("daily_scoreboard_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Weekly roundup", style=discord.ButtonStyle.secondary)
-    async def weekly_roundup(self, interaction: discord.Interaction, _):
-        self.toggle("weekly_roundup_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Rivalry alerts", style=discord.ButtonStyle.secondary)
-    async def rivalry(self, interaction: discord.Interaction, _):
-        self.toggle("rivalry_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Monthly leaderboard", style=discord.ButtonStyle.secondary)
-    async def monthly_lb(self, interaction: discord.Interaction, _):
-        self.toggle("monthly_leaderboard_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Zero-score roasts", style=discord.ButtonStyle.secondary)
-    async def zero(self, interaction: discord.Interaction, _):
-        self.toggle("zero_score_roasts_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Personal best messages", style=discord.ButtonStyle.secondary)
-    async def pb(self, interaction: discord.Interaction, _):
-        self.toggle("pb_messages_enabled")
-        await self._ack(interaction)
-
-    @discord.ui.button(label="Perfect score messages", style=discord.ButtonStyle.secondary)
-    async def perfect(self, interaction: discord.Interaction, _):
-        self.toggle("perfect_score_enabled")
-        await self._ack(interaction)
-
     @discord.ui.button(label="Save alerts", style=discord.ButtonStyle.primary)
     async def save(self, interaction: discord.Interaction, _):
         self.settings_view.settings["alerts"] = self.alerts
@@ -1157,19 +1737,23 @@ class ResetConfirmModal(discord.ui.Modal, title="Confirm Reset"):
 
         guild_id = str(interaction.guild_id)
 
-        # Reset only this guild's data
-        all_scores, scores_sha = github_load_json(SCORES_PATH, {})
-        if isinstance(all_scores, dict):
-            all_scores.pop(guild_id, None)
-            github_save_json(SCORES_PATH, all_scores, scores_sha, f"MapTap reset scores guild {guild_id}")
+        async with data_lock(SCORES_PATH, USERS_PATH):
+            # Reset only this guild's data
+            all_scores, scores_sha = await github_load_json_async(SCORES_PATH, {})
+            if isinstance(all_scores, dict):
+                all_scores.pop(guild_id, None)
+                await github_save_json_async(SCORES_PATH, all_scores, scores_sha, f"MapTap reset scores guild {guild_id}")
 
-        all_users, users_sha = github_load_json(USERS_PATH, {})
-        if isinstance(all_users, dict):
-            all_users.pop(guild_id, None)
-            github_save_json(USERS_PATH, all_users, users_sha, f"MapTap reset users guild {guild_id}")
+            all_users, users_sha = await github_load_json_async(USERS_PATH, {})
+            if isinstance(all_users, dict):
+                all_users.pop(guild_id, None)
+                await github_save_json_async(USERS_PATH, all_users, users_sha, f"MapTap reset users guild {guild_id}")
 
         await interaction.response.send_message("✅ MapTap data reset for this server.", ephemeral=True)
 
+# Settings the bot writes itself (not editable from the settings view)
+BOT_MANAGED_SETTINGS = ("server_streak", "last_run")
+
 class MapTapSettingsView(discord.ui.View):
     def __init__(self, settings: Dict[str, Any], guild_id: str):
         super().__init__(timeout=300)
@@ -1230,7 +1814,15 @@ class MapTapSettingsView(discord.ui.View):
         return e
 
     async def save_and_refresh(self, interaction: discord.Interaction, msg: str):
-        save_guild_settings(self.guild_id, self.settings, msg)
+        async with data_lock(SETTINGS_PATH):
+            # self.settings was loaded when the view opened; take the fields
+            # the bot maintains itself from the current file so this save
+            # doesn't roll them back.
+            current, _ = await load_guild_settings(self.guild_id)
+            for key in BOT_MANAGED_SETTINGS:
+                if key in current:
+                    self.settings[key] = current[key]
+            await save_guild_settings(self.guild_id, self.settings, msg)
         await interaction.response.edit_message(embed=self.embed(), view=self)
 
     @discord.ui.button(label="Toggle bot", style=discord.ButtonStyle.secondary)
@@ -1271,34 +1863,64 @@ async def on_message(message: discord.Message):
     if not message.guild:
         return
 
-    guild_id = str(message.guild.id)
-    settings, _ = load_guild_settings(guild_id)
-
-    if not settings.get("enabled", True):
+    # Cheapest check first: a set lookup against the cached settings.
+    if is_watched_channel(message.channel.id) is False:
         return
 
-    if message.channel.id != settings.get("channel_id"):
+    # Classify the message before touching settings: nearly everything in a
+    # channel is chatter, and none of it needs the settings load. Same
+    # substring prefilter as /rescan ahead of the two regexes.
+    content = message.content or ""
+    lowered = content.lower()
+    if "maptap" not in lowered or "score" not in lowered:
         return
 
-    if not MAPTAP_HINT_REGEX.search(message.content or ""):
+    if not _hint_search(content):
         return
 
-    m = SCORE_REGEX.search(message.content or "")
+    m = _score_search(content)
     if not m:
         return
 
-    score = int(m.group(1))
+    # Settings (server streak), scores and users are all loaded, changed
+    # and saved below; hold their locks throughout so simultaneous posts
+    # are applied one after another instead of overwriting each other.
+    async with data_lock(SETTINGS_PATH, SCORES_PATH, USERS_PATH):
+        replies = await record_score(message, content, int(m.group(1)))
+
+    # Sent once the locks are released, so /settimezone, the settings view
+    # and the next score post don't wait on Discord as well.
+    for text in replies:
+        await message.channel.send(text)
+
+async def record_score(message: discord.Message, content: str, score: int) -> List[str]:
+    """
+    Ingest one score post and return the channel messages it earned, for
+    the caller to send. Caller holds data_lock(SETTINGS_PATH, SCORES_PATH, USERS_PATH).
+    """
+    guild_id = str(message.guild.id)
+    settings, _ = await load_guild_settings(guild_id)
+    replies: List[str] = []
+
+    if not settings.get("enabled", True):
+        return replies
+
+    if message.channel.id != settings.get("channel_id"):
+        return replies
+
     if score > MAX_SCORE:
-        await react_safe(message, settings["emojis"]["too_high"], "❌")
-        return
+        spawn(react_safe(message, settings["emojis"]["too_high"], "❌"))
+        return replies
 
     tz = get_guild_tz(settings)
-    msg_time = message.created_at.replace(tzinfo=ZoneInfo("UTC")).astimezone(tz)
+    msg_time = message.created_at.astimezone(tz)
     dkey = today_key(msg_time, tz)
     uid = str(message.author.id)
 
-    all_scores, guild_scores, scores_sha = load_guild_scores(guild_id)
-    all_users, guild_users, users_sha = load_guild_users(guild_id)
+    (all_scores, guild_scores, scores_sha), (all_users, guild_users, users_sha) = await asyncio.gather(
+        load_guild_scores(guild_id),
+        load_guild_users(guild_id),
+    )
 
     guild_scores.setdefault(dkey, {})
     guild_users.setdefault(uid, default_user_stats())
@@ -1313,15 +1935,12 @@ async def on_message(message: discord.Message):
     # Duplicate score detection — keep first score, embarrass them publicly
     if uid in guild_scores[dkey]:
         existing_score = int(guild_scores[dkey][uid].get("score", 0))
-        DUPLICATE_MSGS = [
-            f"🙄 {message.author.mention} already submitted a score today (**{existing_score}**). Nice try though.",
-            f"😂 {message.author.mention} thought they could sneak in a better score — already got **{existing_score}** locked in, cheers!",
-            f"🗺️ One map per day, {message.author.mention}. Your **{existing_score}** is already on the board.",
-            f"👀 {message.author.mention} tried to update their score to **{score}** but we're keeping the **{existing_score}**. The first one counts!",
-            f"🤡 Duplicate detected! {message.author.mention}'s **{existing_score}** is staying put. No score shopping here.",
-        ]
-        await message.channel.send(random.choice(DUPLICATE_MSGS))
-        return
+        replies.append(
+            random.choice(DUPLICATE_MSGS).format(
+                mention=message.author.mention, existing=existing_score, score=score
+            )
+        )
+        return replies
 
     guild_users[uid]["days_played"] += 1
     guild_users[uid]["total_points"] += score
@@ -1336,14 +1955,15 @@ async def on_message(message: discord.Message):
     })
     
     last_score_date = streak_data.get("last_score_date")
+    streak_changed = last_score_date != dkey
     
-    if last_score_date != dkey:
+    if streak_changed:
         new_current = 1
     
         if last_score_date:
             try:
-                last_date = datetime.strptime(last_score_date, "%Y-%m-%d").date()
-                current_date = datetime.strptime(dkey, "%Y-%m-%d").date()
+                last_date = parse_date_key(last_score_date)
+                current_date = parse_date_key(dkey)
     
                 if current_date == last_date + timedelta(days=1):
                     new_current = int(streak_data.get("current", 0)) + 1
@@ -1358,17 +1978,12 @@ async def on_message(message: discord.Message):
     alerts = settings.get("alerts", DEFAULT_GUILD_SETTINGS["alerts"])
 
     # Zero roast
-    if alerts.get("zero_score_roasts_enabled", True) and has_zero_round(message.content or ""):
-        await message.channel.send(
-            random.choice([
-                f"💀 {message.author.mention} dropped a **0** round",
-                f"🗺️ {message.author.mention} learned nothing today",
-            ])
-        )
+    if alerts.get("zero_score_roasts_enabled", True) and has_zero_round(content):
+        replies.append(random.choice(ZERO_ROAST_MSGS).format(mention=message.author.mention))
 
     # Perfect score
     if alerts.get("perfect_score_enabled", True) and score >= MAX_SCORE:
-        await message.channel.send(
+        replies.append(
             f"🎯 **Perfect Score!** {message.author.mention} just hit **{score}**!"
         )
 
@@ -1377,7 +1992,7 @@ async def on_message(message: discord.Message):
     if score > old_pb:
         guild_users[uid]["personal_best"] = {"score": score, "date": dkey}
         if alerts.get("pb_messages_enabled", True) and old_pb > 0:
-            await message.channel.send(
+            replies.append(
                 f"🚀 **New Personal Best!**\n"
                 f"{message.author.mention} just beat their previous record of **{old_pb}** with **{score}**!"
             )
@@ -1387,81 +2002,109 @@ async def on_message(message: discord.Message):
     if score < old_low:
         guild_users[uid]["personal_low"] = {"score": score, "date": dkey}
         if alerts.get("pb_messages_enabled", True) and old_low != 100000:
-            await message.channel.send(
+            replies.append(
                 f"🧯 **New Personal Low!**\n"
                 f"{message.author.mention} just went lower than their previous worst (**{old_low}**) with **{score}** 😭"
             )
 
-    # Streaks
-    cur = calculate_current_streak(guild_scores, uid, tz)
+    # Streaks — extend yesterday's stored streak by one where it's
+    # trustworthy (same check as user_current_streak); only walk the scores
+    # when the stored fields are missing or stale.
+    stats = guild_users[uid]
+    yesterday = (msg_time.date() - timedelta(days=1)).isoformat()
+    if uid not in guild_scores.get(yesterday, {}):
+        cur = 1
+    elif stats.get("last_played") == yesterday and isinstance(stats.get("current_streak"), int):
+        cur = stats["current_streak"] + 1
+    else:
+        cur = calculate_current_streak(guild_scores, uid, tz)
+    guild_users[uid]["current_streak"] = cur
+    guild_users[uid]["last_played"] = dkey
     try:
         guild_users[uid]["best_streak"] = max(int(guild_users[uid].get("best_streak", 0)), int(cur))
     except Exception:
         guild_users[uid]["best_streak"] = cur
 
+    # Reactions are independent of the saves below, so run them alongside
+    # instead of after.
+    reactions = [(settings["emojis"]["recorded"], "✅")]
+    if score >= 900:
+        reactions += [("🔥", "🔥"), ("🎉", "🎉")]
+    elif score < 650:
+        reactions += [("💩", "💩"), ("🚽", "🚽")]
+    spawn(react_all(message, reactions))
+
     try:
-        save_guild_scores(guild_id, all_scores, guild_scores, scores_sha, "MapTap score update")
-        save_guild_users(guild_id, all_users, guild_users, users_sha, "MapTap user update")
-        save_guild_settings(guild_id, settings, "MapTap: update server streak")
+        await save_guild_scores(guild_id, all_scores, guild_scores, scores_sha, "MapTap score update", deferred=True)
+        await save_guild_users(guild_id, all_users, guild_users, users_sha, "MapTap user update", deferred=True)
+        # Only the first post of the day moves the server streak.
+        if streak_changed:
+            await save_guild_settings(guild_id, settings, "MapTap: update server streak", deferred=True)
     except requests.exceptions.RequestException as e:
         # GitHub had a hiccup (slow handshake / read timeout) even after our
         # automatic retries. Don't let that abort the rest of this handler —
         # the user still gets their reactions, and we just log the failure
         # instead of losing this score update silently.
         print(f"⚠️ on_message: failed to save data for guild {guild_id} after retries: {e}")
-    await react_safe(message, settings["emojis"]["recorded"], "✅")
-    if score >= 900:
-        await react_safe(message, "🔥", "🔥")
-        await react_safe(message, "🎉", "🎉")
-    elif score < 650:
-        await react_safe(message, "💩", "💩")
-        await react_safe(message, "🚽", "🚽")
+
+    return replies
 
 # =====================================================
 # SCHEDULED ACTIONS
 # =====================================================
+# The fixed parts of the scheduled posts only depend on module constants,
+# so build them once at import instead of on every post.
+_DAILY_PROMPT_HEAD = (
+    "🗺️ **Daily MapTap is live!**\n"
+    f"👉 {MAPTAP_URL}\n\n"
+)
+_DAILY_PROMPT_TAIL = "Post your results **exactly as shared from the app** so I can track scores ✈️"
+_DAILY_PROMPT_NO_STREAK = (
+    _DAILY_PROMPT_HEAD
+    + "✨ No active streak yet — today’s a good day to start one!\n\n"
+    + _DAILY_PROMPT_TAIL
+)
+_DAILY_SCOREBOARD_TITLE = "🗺️ **MapTap — Daily Scores**\n"
+_WEEKLY_ROUNDUP_TITLE = "🗺️ **MapTap — Weekly Round-Up**\n"
+
 def build_daily_prompt(streak: int) -> str:
-    streak_line = (
+    if streak <= 0:
+        return _DAILY_PROMPT_NO_STREAK
+    return (
+        f"{_DAILY_PROMPT_HEAD}"
         f"🔥 **Your server is on a {streak}-day streak** — keep it going today!\n\n"
-        if streak > 0 else
-        "✨ No active streak yet — today’s a good day to start one!\n\n"
+        f"{_DAILY_PROMPT_TAIL}"
     )
 
-    return (
-        "🗺️ **Daily MapTap is live!**\n"
-        f"👉 {MAPTAP_URL}\n\n"
-        f"{streak_line}"
-        "Post your results **exactly as shared from the app** so I can track scores ✈️"
-    )
 def build_daily_scoreboard_text(date_key: str, rows: List[Tuple[str, int]]) -> str:
     try:
-        pretty = datetime.strptime(date_key, "%Y-%m-%d").strftime("%A %d %B")
+        pretty = pretty_day(date_key)
     except Exception:
         pretty = date_key
 
+    header = f"{_DAILY_SCOREBOARD_TITLE}*{pretty}*\n\n"
     if not rows:
-        return f"🗺️ **MapTap — Daily Scores**\n*{pretty}*\n\n😶 No scores today."
+        return header + "😶 No scores today."
 
-    lines = [f"{i}. <@{uid}> — **{score}**" for i, (uid, score) in enumerate(rows, start=1)]
     return (
-        f"🗺️ **MapTap — Daily Scores**\n*{pretty}*\n\n"
-        + "\n".join(lines)
+        header
+        + "\n".join(f"{i}. <@{uid}> — **{score}**" for i, (uid, score) in enumerate(rows, start=1))
         + f"\n\n✈️ Players today: **{len(rows)}**"
     )
 
 def build_weekly_roundup_text(mon: date, sun: date, rows: List[Tuple[str, int, int]]) -> str:
-    header = (
-        "🗺️ **MapTap — Weekly Round-Up**\n"
-        f"*Mon {mon.strftime('%d %b')} → Sun {sun.strftime('%d %b')}*\n\n"
-    )
+    header = f"{_WEEKLY_ROUNDUP_TITLE}*Mon {mon.strftime('%d %b')} → Sun {sun.strftime('%d %b')}*\n\n"
     if not rows:
         return header + "😶 No scores this week."
 
-    lines = [
-        f"{i}. <@{uid}> — **{total} pts** ({days}/7 days)"
-        for i, (uid, total, days) in enumerate(rows, start=1)
-    ]
-    return header + "\n".join(lines) + f"\n\n✈️ Weekly players: **{len(rows)}**"
+    return (
+        header
+        + "\n".join(
+            f"{i}. <@{uid}> — **{total} pts** ({days}/7 days)"
+            for i, (uid, total, days) in enumerate(rows, start=1)
+        )
+        + f"\n\n✈️ Weekly players: **{len(rows)}**"
+    )
 
 async def do_daily_post(guild_id: str, settings: Dict[str, Any]):
     ch = get_configured_channel(settings)
@@ -1477,7 +2120,7 @@ async def do_daily_post(guild_id: str, settings: Dict[str, Any]):
 
     if last_score_date:
         try:
-            last_date = datetime.strptime(last_score_date, "%Y-%m-%d").date()
+            last_date = parse_date_key(last_score_date)
             if last_date not in (today, today - timedelta(days=1)):
                 streak = 0
         except Exception:
@@ -1493,29 +2136,32 @@ async def do_daily_scoreboard(guild_id: str, settings: Dict[str, Any]):
         return
 
     tz = get_guild_tz(settings)
-    _, guild_scores, _ = load_guild_scores(guild_id)
+    _, guild_scores, _ = await load_guild_scores(guild_id)
 
-    today = datetime.now(tz).date().isoformat()
+    today_d = datetime.now(tz).date()
+    today = today_d.isoformat()
     bucket = guild_scores.get(today, {})
 
     rows: List[Tuple[str, int]] = []
     if isinstance(bucket, dict):
         for uid, entry in bucket.items():
-            try:
-                rows.append((uid, int(entry["score"])))
-            except Exception:
-                pass
+            sc = _score_of(entry)
+            if sc is not None:
+                rows.append((uid, sc))
 
-    rows.sort(key=lambda x: x[1], reverse=True)
+    rows.sort(key=itemgetter(1), reverse=True)
     await ch.send(build_daily_scoreboard_text(today, rows))
 
     # Cleanup old scores for this guild only
-    all_scores, _, sha = load_guild_scores(guild_id)
-    cutoff = datetime.now(tz).date() - timedelta(days=CLEANUP_DAYS)
-    cleaned = {d: v for d, v in guild_scores.items() if (dd := _safe_date(d)) and dd >= cutoff}
+    async with data_lock(SCORES_PATH):
+        all_scores, guild_scores, sha = await load_guild_scores(guild_id)
+        cutoff = (today_d - timedelta(days=CLEANUP_DAYS)).isoformat()
+        cleaned = {d: v for d, v in guild_scores.items() if d >= cutoff and _safe_date(d)}
 
-    if cleaned != guild_scores:
-        save_guild_scores(guild_id, all_scores, cleaned, sha, f"MapTap cleanup guild {guild_id}")
+        # cleaned only ever drops keys, so a length check says whether
+        # anything went without comparing every nested entry.
+        if len(cleaned) != len(guild_scores):
+            await save_guild_scores(guild_id, all_scores, cleaned, sha, f"MapTap cleanup guild {guild_id}")
 
 async def do_weekly_roundup(guild_id: str, settings: Dict[str, Any]):
     ch = get_configured_channel(settings)
@@ -1523,19 +2169,20 @@ async def do_weekly_roundup(guild_id: str, settings: Dict[str, Any]):
         return
 
     tz = get_guild_tz(settings)
-    _, guild_scores, _ = load_guild_scores(guild_id)
+    scores_rev = data_revision(SCORES_PATH)
+    _, guild_scores, _ = await load_guild_scores(guild_id)
 
     today = datetime.now(tz).date()
     mon, sun = week_range(today)
 
-    weekly = compute_period_rows(guild_scores, mon, sun)
+    weekly = compute_period_rows(guild_scores, mon, sun, (guild_id, scores_rev))
 
     rows: List[Tuple[str, int, int]] = [
         (uid, int(v["total"]), int(v["days"]))
         for uid, v in weekly.items()
         if v["days"] > 0
     ]
-    rows.sort(key=lambda x: x[1], reverse=True)
+    rows.sort(key=itemgetter(1), reverse=True)
     await ch.send(build_weekly_roundup_text(mon, sun, rows))
 
 async def do_monthly_leaderboard(guild_id: str, settings: Dict[str, Any]):
@@ -1544,12 +2191,13 @@ async def do_monthly_leaderboard(guild_id: str, settings: Dict[str, Any]):
         return
 
     tz = get_guild_tz(settings)
-    _, guild_scores, _ = load_guild_scores(guild_id)
+    scores_rev = data_revision(SCORES_PATH)
+    _, guild_scores, _ = await load_guild_scores(guild_id)
 
     today = datetime.now(tz).date()
     start_d, end_d = month_range(today)
 
-    totals = compute_period_rows(guild_scores, start_d, end_d)
+    totals = compute_period_rows(guild_scores, start_d, end_d, (guild_id, scores_rev))
     min_days = int(settings.get("minimum_days", {}).get("this_month", 0))
 
     rows: List[Tuple[str, int]] = []
@@ -1559,8 +2207,7 @@ async def do_monthly_leaderboard(guild_id: str, settings: Dict[str, Any]):
         avg = round(v["total"] / v["days"])
         rows.append((uid, avg))
 
-    rows.sort(key=lambda x: x[1], reverse=True)
-    rows = rows[:10]
+    rows = heapq.nlargest(10, rows, key=itemgetter(1))
     if not rows:
         return
 
@@ -1577,12 +2224,13 @@ async def do_rivalry_alert(guild_id: str, settings: Dict[str, Any]):
         return
 
     tz = get_guild_tz(settings)
-    _, guild_scores, _ = load_guild_scores(guild_id)
+    scores_rev = data_revision(SCORES_PATH)
+    _, guild_scores, _ = await load_guild_scores(guild_id)
 
     today = datetime.now(tz).date()
     mon, _ = week_range(today)
 
-    totals = compute_period_rows(guild_scores, mon, today)
+    totals = compute_period_rows(guild_scores, mon, today, (guild_id, scores_rev))
     if len(totals) < RIVALRY_MIN_PLAYERS:
         return
 
@@ -1591,7 +2239,7 @@ async def do_rivalry_alert(guild_id: str, settings: Dict[str, Any]):
         for uid, v in totals.items()
         if v["days"] > 0
     ]
-    leaderboard.sort(key=lambda x: x[1], reverse=True)
+    leaderboard.sort(key=itemgetter(1), reverse=True)
 
     best_pair = None
     best_diff = None
@@ -1618,6 +2266,58 @@ async def do_rivalry_alert(guild_id: str, settings: Dict[str, Any]):
         "One day can change everything 👀"
     )
 
+# Scheduled jobs, in firing order:
+# (last_run/times field, alerts toggle, extra day check on local `now`, job, log name)
+SCHEDULED_JOBS: List[Tuple[str, str, Optional[Callable[[datetime], bool]], Callable[..., Awaitable[None]], str]] = [
+    ("daily_post", "daily_post_enabled", None, do_daily_post, "daily_post"),
+    ("daily_scoreboard", "daily_scoreboard_enabled", None, do_daily_scoreboard, "daily_scoreboard"),
+    # Sundays in the guild's local time
+    ("weekly_roundup", "weekly_roundup_enabled", lambda now: now.weekday() == 6, do_weekly_roundup, "weekly_roundup"),
+    ("rivalry", "rivalry_enabled", None, do_rivalry_alert, "rivalry_alert"),
+    # 1st of the month in the guild's local time
+    ("monthly_leaderboard", "monthly_leaderboard_enabled", lambda now: now.day == 1, do_monthly_leaderboard, "monthly_leaderboard"),
+]
+
+# Epoch time before which no scheduled job can become due, worked out at the
+# end of each tick from the settings it just used. Ticks before then return
+# without loading settings. save_all_settings resets it, since any edit to
+# times/alerts/enabled (or a new guild) can move the next job earlier.
+# Edits made by hand in the data repo don't go through save_all_settings,
+# so it's never more than SETTINGS_CACHE_TTL away: that tick's settings
+# load picks up a changed sha (and is only a cache hit or a 304 otherwise).
+_SCHEDULE_STATE: Dict[str, float] = {"next_check": 0.0}
+
+def next_schedule_check(all_settings: Dict[str, Any]) -> float:
+    wake_ups: List[float] = [time.time() + SETTINGS_CACHE_TTL]
+
+    for settings in all_settings.values():
+        if not settings.get("enabled", True):
+            continue
+
+        tz = get_guild_tz(settings)
+        now = datetime.now(tz)
+        today = today_key(now, tz)
+        times = settings.get("times", {})
+        last_run = settings.get("last_run", {})
+        alerts = settings.get("alerts", {})
+
+        # The day rolls over at local midnight: every job is eligible again.
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+        wake_ups.append(tomorrow.timestamp())
+
+        for field, alert_key, day_check, _job, _name in SCHEDULED_JOBS:
+            if not alerts.get(alert_key, True):
+                continue
+            if day_check is not None and not day_check(now):
+                continue
+            scheduled = times.get(field)
+            if not scheduled or last_run.get(field) == today:
+                continue
+            hh, mm = parse_hhmm(scheduled)
+            wake_ups.append(now.replace(hour=hh, minute=mm, second=0, microsecond=0).timestamp())
+
+    return min(wake_ups)
+
 # =====================================================
 # SLASH COMMANDS
 # =====================================================
@@ -1631,7 +2331,7 @@ async def settimezone(interaction: discord.Interaction, timezone: str):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    settings, _ = await load_guild_settings(guild_id)
 
     if not has_admin_access(interaction.user, settings):
         await interaction.response.send_message("❌ You don't have permission to do that.", ephemeral=True)
@@ -1646,8 +2346,10 @@ async def settimezone(interaction: discord.Interaction, timezone: str):
         )
         return
 
-    settings["timezone"] = timezone
-    save_guild_settings(guild_id, settings, f"MapTap: set timezone {timezone}")
+    async with data_lock(SETTINGS_PATH):
+        settings, _ = await load_guild_settings(guild_id)
+        settings["timezone"] = timezone
+        await save_guild_settings(guild_id, settings, f"MapTap: set timezone {timezone}")
 
     await interaction.response.send_message(
         f"✅ Timezone set to **{timezone}**. All scheduled times will now use this timezone.",
@@ -1656,7 +2358,7 @@ async def settimezone(interaction: discord.Interaction, timezone: str):
 
 @settimezone.autocomplete("timezone")
 async def timezone_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-    all_tz = sorted(available_timezones())
+    all_tz = sorted_timezones()
     if current:
         matches = [tz for tz in all_tz if current.lower() in tz.lower()]
     else:
@@ -1678,12 +2380,14 @@ async def mymaptap(interaction: discord.Interaction):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    users_rev, scores_rev = data_revision(USERS_PATH), data_revision(SCORES_PATH)
+    (settings, _), (_, guild_users, _), (_, guild_scores, _) = await asyncio.gather(
+        load_guild_settings(guild_id),
+        load_guild_users(guild_id),
+        load_guild_scores(guild_id),
+    )
     tz = get_guild_tz(settings)
 
-    _, guild_users, _ = load_guild_users(guild_id)
-    _, guild_scores, _ = load_guild_scores(guild_id)
-
     uid = str(interaction.user.id)
     stats = guild_users.get(uid)
 
@@ -1697,22 +2401,25 @@ async def mymaptap(interaction: discord.Interaction):
     stats.setdefault("total_points", 0)
     stats.setdefault("days_played", 0)
 
-    rank, total_players = calculate_all_time_rank(guild_users, uid)
-    current_streak = calculate_current_streak(guild_scores, uid, tz)
+    rank, total_players = calculate_all_time_rank(guild_users, uid, (guild_id, users_rev))
+    current_streak = user_current_streak(stats, guild_scores, uid, tz)
     average_score = round(int(stats["total_points"]) / max(1, int(stats["days_played"])))
 
     today = datetime.now(tz).date()
     week_start = today - timedelta(days=today.weekday())
-    week_rank, week_total = calculate_period_rank(guild_scores, uid, week_start, today)
-    global_rank, global_total = calculate_global_rank(uid)
+    week_rank, week_total = calculate_period_rank(guild_scores, uid, week_start, today, (guild_id, scores_rev))
+    # Independent lookups (users file and miles file): fetch together
+    (global_rank, global_total), miles_balance = await asyncio.gather(
+        calculate_global_rank(uid),
+        get_user_miles(uid),
+    )
     days_played = int(stats.get("days_played", 0))
-    miles_balance = get_user_miles(uid)
 
     pb = stats["personal_best"]
     pb_date = pb.get("date", "N/A")
     if pb_date != "N/A":
         try:
-            pb_date = datetime.strptime(pb_date, "%Y-%m-%d").strftime("%d %b %Y")
+            pb_date = short_day(pb_date)
         except Exception:
             pass
 
@@ -1721,7 +2428,7 @@ async def mymaptap(interaction: discord.Interaction):
     low_date = pl.get("date", "N/A")
     if low_date != "N/A":
         try:
-            low_date = datetime.strptime(low_date, "%Y-%m-%d").strftime("%d %b %Y")
+            low_date = short_day(low_date)
         except Exception:
             pass
 
@@ -1875,15 +2582,14 @@ async def predict(interaction: discord.Interaction, user: Optional[discord.Membe
     guild_id = str(interaction.guild_id)
     uid = str(target.id)
 
-    _, guild_scores, _ = load_guild_scores(guild_id)
+    _, guild_scores, _ = await load_guild_scores(guild_id)
 
     all_scores: List[int] = []
     for dkey, bucket in guild_scores.items():
         if isinstance(bucket, dict) and uid in bucket:
-            try:
-                all_scores.append(int(bucket[uid]["score"]))
-            except Exception:
-                continue
+            sc = _score_of(bucket[uid])
+            if sc is not None:
+                all_scores.append(sc)
 
     target_name = target.nick or target.global_name or target.name
     is_self = target.id == interaction.user.id
@@ -1927,7 +2633,7 @@ async def maptapsettings(interaction: discord.Interaction):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    settings, _ = await load_guild_settings(guild_id)
 
     if not has_admin_access(interaction.user, settings):
         await interaction.response.send_message("❌ You don't have permission to configure MapTap.", ephemeral=True)
@@ -1952,7 +2658,8 @@ class LeaderboardSelect(discord.ui.Select):
     async def callback(self, interaction: discord.Interaction):
         scope = self.values[0]
         tz = get_guild_tz(self.settings)
-        _, guild_scores, _ = load_guild_scores(self.guild_id)
+        scores_rev = data_revision(SCORES_PATH)
+        _, guild_scores, _ = await load_guild_scores(self.guild_id)
 
         today = datetime.now(tz).date()
         start_d = end_d = None
@@ -1964,18 +2671,20 @@ class LeaderboardSelect(discord.ui.Select):
             start_d = today.replace(day=1)
             end_d = today
 
-        totals = compute_period_rows(guild_scores, start_d, end_d)
+        totals = compute_period_rows(guild_scores, start_d, end_d, (self.guild_id, scores_rev))
         min_days = int(self.settings.get("minimum_days", {}).get(scope, 0))
 
-        rows: List[Tuple[str, int]] = []
-        for uid, v in totals.items():
-            if v["days"] < min_days:
-                continue
-            avg = round(v["total"] / v["days"])
-            rows.append((uid, avg))
-
-        rows.sort(key=lambda x: x[1], reverse=True)
-        rows = rows[:20]
+        # Only the top 20 are shown: partial selection instead of sorting
+        # every player (nlargest keeps the same order, ties included).
+        rows = heapq.nlargest(
+            20,
+            (
+                (uid, round(v["total"] / v["days"]))
+                for uid, v in totals.items()
+                if v["days"] >= min_days
+            ),
+            key=itemgetter(1),
+        )
 
         embed = discord.Embed(
             title="🗺️ MapTap Leaderboard",
@@ -2019,7 +2728,7 @@ async def leaderboard(interaction: discord.Interaction):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    settings, _ = await load_guild_settings(guild_id)
 
     await interaction.response.send_message(
         embed=discord.Embed(
@@ -2108,12 +2817,16 @@ class GlobalLeaderboardView(discord.ui.View):
 async def global_leaderboard(interaction: discord.Interaction):
     await interaction.response.defer()
 
-    all_users, _ = github_load_json(USERS_PATH, {})
+    (all_users, _), (all_settings, _), (all_scores, _) = await asyncio.gather(
+        github_load_json_async(USERS_PATH, {}, DATA_CACHE_TTL),
+        load_all_settings(),
+        github_load_json_async(SCORES_PATH, {}, DATA_CACHE_TTL),
+    )
     if not isinstance(all_users, dict):
         await interaction.followup.send("❌ Could not load global data.", ephemeral=True)
         return
 
-    global_avgs: Dict[str, List[float]] = {}
+    global_avgs: Dict[str, List[float]] = defaultdict(list)
     global_best_streaks: Dict[str, int] = {}
 
     for guild_id, guild_users in all_users.items():
@@ -2139,7 +2852,7 @@ async def global_leaderboard(interaction: discord.Interaction):
                 if days < 5:
                     continue
                 avg = float(stats["total_points"]) / float(days)
-                global_avgs.setdefault(uid, []).append(avg)
+                global_avgs[uid].append(avg)
                 best = int(stats.get("best_streak", 0))
                 global_best_streaks[uid] = max(global_best_streaks.get(uid, 0), best)
             except Exception:
@@ -2149,12 +2862,11 @@ async def global_leaderboard(interaction: discord.Interaction):
         await interaction.followup.send("No global scores found yet.", ephemeral=True)
         return
 
-    top10_avg = sorted([(uid, sum(avgs) / len(avgs)) for uid, avgs in global_avgs.items()], key=lambda x: x[1], reverse=True)[:10]
-    top5_streak = sorted(global_best_streaks.items(), key=lambda x: x[1], reverse=True)[:5]
+    top10_avg = heapq.nlargest(10, ((uid, sum(avgs) / len(avgs)) for uid, avgs in global_avgs.items()), key=itemgetter(1))
+    top5_streak = heapq.nlargest(5, global_best_streaks.items(), key=itemgetter(1))
     total = len(all_player_ids)
 
     # Build top 5 servers by best streak from settings
-    all_settings, _ = load_all_settings()
     server_streaks: List[Tuple[str, str, int]] = []
     for gid, gsettings in all_settings.items():
         streak_data = gsettings.get("server_streak", {})
@@ -2164,26 +2876,24 @@ async def global_leaderboard(interaction: discord.Interaction):
         guild_obj = client.get_guild(int(gid))
         name = guild_obj.name if guild_obj else f"Server {gid}"
         server_streaks.append((gid, name, current))
-    server_streaks.sort(key=lambda x: x[2], reverse=True)
-    top5_servers = server_streaks[:5]
+    top5_servers = heapq.nlargest(5, server_streaks, key=itemgetter(2))
 
     # Build current streaks from scores data
-    all_scores, _ = github_load_json(SCORES_PATH, {})
     global_current_streaks: Dict[str, int] = {}
     for guild_id, guild_users in all_users.items():
         if not isinstance(guild_users, dict):
             continue
         guild_scores = all_scores.get(guild_id, {}) if isinstance(all_scores, dict) else {}
-        guild_settings = all_settings.get(guild_id, _normalize_guild_settings({}))
+        guild_settings = all_settings.get(guild_id) or _normalize_guild_settings({})
         tz = get_guild_tz(guild_settings)
-        for uid in guild_users:
+        for uid, stats in guild_users.items():
             try:
-                cur = calculate_current_streak(guild_scores, uid, tz)
+                cur = user_current_streak(stats, guild_scores, uid, tz)
                 if cur > 0:
                     global_current_streaks[uid] = max(global_current_streaks.get(uid, 0), cur)
             except Exception:
                 continue
-    top5_current = sorted(global_current_streaks.items(), key=lambda x: x[1], reverse=True)[:5]
+    top5_current = heapq.nlargest(5, global_current_streaks.items(), key=itemgetter(1))
 
     uids_needed = list({uid for uid, _ in top10_avg} | {uid for uid, _ in top5_streak} | {uid for uid, _ in top5_current})
     names: Dict[str, str] = {}
@@ -2198,7 +2908,7 @@ async def global_leaderboard(interaction: discord.Interaction):
 @client.tree.command(name="miles", description="Check your MapTap Miles balance")
 async def miles_command(interaction: discord.Interaction):
     uid = str(interaction.user.id)
-    balance = get_user_miles(uid)
+    balance = await get_user_miles(uid)
     embed = discord.Embed(title="✈️ Your MapTap Miles", color=0xF1C40F)
     embed.add_field(
         name="Balance",
@@ -2227,72 +2937,78 @@ async def redeem_command(interaction: discord.Interaction):
 
     guild_id = str(interaction.guild_id)
     uid = str(interaction.user.id)
-    settings, _ = load_guild_settings(guild_id)
-    tz = get_guild_tz(settings)
-
-    miles_data, miles_sha = load_miles()
-    entry = miles_data.get(uid, _default_miles_entry())
-    balance = int(entry.get("miles", 0))
-
-    if balance < 5:
-        await interaction.response.send_message(
-            f"✈️ You only have **{balance} Mile{'s' if balance != 1 else ''}** — you need **5** to redeem a streak restore.\n"
-            f"Vote on top.gg with `/vote` to earn more!",
-            ephemeral=True,
+    async with data_lock(MILES_PATH, SCORES_PATH):
+        (settings, _), (miles_data, miles_sha) = await asyncio.gather(
+            load_guild_settings(guild_id),
+            load_miles(),
         )
-        return
-
-    _, guild_scores, _ = load_guild_scores(guild_id)
-    all_users, guild_users, users_sha = load_guild_users(guild_id)
+        tz = get_guild_tz(settings)
 
-    today = datetime.now(tz).date()
-    yesterday = (today - timedelta(days=1)).isoformat()
-    today_str = today.isoformat()
+        entry = miles_data.get(uid, _default_miles_entry())
+        balance = int(entry.get("miles", 0))
 
-    # Check they played yesterday (i.e. had a streak that continued to yesterday)
-    # and have NOT already posted today (streak is currently broken)
-    played_yesterday = uid in guild_scores.get(yesterday, {})
-    played_today = uid in guild_scores.get(today_str, {})
-    current_streak = calculate_current_streak(guild_scores, uid, tz)
+        if balance < 5:
+            await interaction.response.send_message(
+                f"✈️ You only have **{balance} Mile{'s' if balance != 1 else ''}** — you need **5** to redeem a streak restore.\n"
+                f"Vote on top.gg with `/vote` to earn more!",
+                ephemeral=True,
+            )
+            return
 
-    if not played_yesterday:
-        await interaction.response.send_message(
-            "❌ You didn't play yesterday, so there's no streak to restore!\n"
-            "Redeeming only works the day after you missed — you can't restore old streaks.",
-            ephemeral=True,
+        (_, guild_scores, _), (all_users, guild_users, users_sha) = await asyncio.gather(
+            load_guild_scores(guild_id),
+            load_guild_users(guild_id),
         )
-        return
 
-    if current_streak > 0:
-        await interaction.response.send_message(
-            f"✅ Your streak is already active (**{current_streak} days**) — nothing to restore!",
-            ephemeral=True,
-        )
-        return
+        now = datetime.now(tz)
+        today = now.date()
+        yesterday = (today - timedelta(days=1)).isoformat()
+        today_str = today.isoformat()
+
+        # Check they played yesterday (i.e. had a streak that continued to yesterday)
+        # and have NOT already posted today (streak is currently broken)
+        played_yesterday = uid in guild_scores.get(yesterday, {})
+        played_today = uid in guild_scores.get(today_str, {})
+        current_streak = calculate_current_streak(guild_scores, uid, tz)
+
+        if not played_yesterday:
+            await interaction.response.send_message(
+                "❌ You didn't play yesterday, so there's no streak to restore!\n"
+                "Redeeming only works the day after you missed — you can't restore old streaks.",
+                ephemeral=True,
+            )
+            return
 
-    if played_today:
-        await interaction.response.send_message(
-            "❌ You've already posted today. If your streak shows as broken, make sure yesterday's score is recorded.",
-            ephemeral=True,
-        )
-        return
+        if current_streak > 0:
+            await interaction.response.send_message(
+                f"✅ Your streak is already active (**{current_streak} days**) — nothing to restore!",
+                ephemeral=True,
+            )
+            return
 
-    # All good — inject a placeholder score for today to bridge the gap
-    # We use score 0 with a special flag so it doesn't affect stats
-    guild_scores.setdefault(today_str, {})
-    guild_scores[today_str][uid] = {
-        "score": guild_scores[yesterday][uid].get("score", 0),
-        "updated_at": datetime.now(tz).isoformat(),
-        "streak_restored": True,
-    }
+        if played_today:
+            await interaction.response.send_message(
+                "❌ You've already posted today. If your streak shows as broken, make sure yesterday's score is recorded.",
+                ephemeral=True,
+            )
+            return
 
-    # Deduct 5 Miles
-    entry["miles"] = balance - 5
-    miles_data[uid] = entry
-    save_miles(miles_data, miles_sha, f"MapTap: redeem streak restore uid {uid}")
+        # All good — inject a placeholder score for today to bridge the gap
+        # We use score 0 with a special flag so it doesn't affect stats
+        guild_scores.setdefault(today_str, {})
+        guild_scores[today_str][uid] = {
+            "score": guild_scores[yesterday][uid].get("score", 0),
+            "updated_at": now.isoformat(),
+            "streak_restored": True,
+        }
+
+        # Deduct 5 Miles
+        entry["miles"] = balance - 5
+        miles_data[uid] = entry
+        await save_miles(miles_data, miles_sha, f"MapTap: redeem streak restore uid {uid}")
 
-    all_scores, _, scores_sha = load_guild_scores(guild_id)
-    save_guild_scores(guild_id, all_scores, guild_scores, scores_sha, f"MapTap: streak restore uid {uid}")
+        all_scores, _, scores_sha = await load_guild_scores(guild_id)
+        await save_guild_scores(guild_id, all_scores, guild_scores, scores_sha, f"MapTap: streak restore uid {uid}")
 
     new_streak = calculate_current_streak(guild_scores, uid, tz)
     remaining = balance - 5
@@ -2313,7 +3029,7 @@ async def rescan(interaction: discord.Interaction):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    settings, _ = await load_guild_settings(guild_id)
 
     if not has_admin_access(interaction.user, settings):
         await interaction.response.send_message("❌ No permission", ephemeral=True)
@@ -2329,15 +3045,23 @@ async def rescan(interaction: discord.Interaction):
 
     guild_scores: Dict[str, Dict[str, Dict[str, Any]]] = {}
     guild_users: Dict[str, Dict[str, Any]] = {}
+    to_react: List[discord.Message] = []
     ingested = 0
 
     async for msg in channel.history(limit=None, oldest_first=True):
         if msg.author.bot:
             continue
-        if not MAPTAP_HINT_REGEX.search(msg.content or ""):
+        content = msg.content or ""
+        # Cheap C-level substring check first: most channel chatter isn't a
+        # score post, so skip the two IGNORECASE regex searches for it.
+        # ("final score" can't be used — SCORE_REGEX allows any whitespace.)
+        lowered = content.lower()
+        if "maptap" not in lowered or "score" not in lowered:
+            continue
+        if not _hint_search(content):
             continue
 
-        m = SCORE_REGEX.search(msg.content or "")
+        m = _score_search(content)
         if not m:
             continue
 
@@ -2345,7 +3069,7 @@ async def rescan(interaction: discord.Interaction):
         if score > MAX_SCORE:
             continue
 
-        msg_time = msg.created_at.replace(tzinfo=ZoneInfo("UTC")).astimezone(tz)
+        msg_time = msg.created_at.astimezone(tz)
         dkey = today_key(msg_time, tz)
         uid = str(msg.author.id)
 
@@ -2354,6 +3078,7 @@ async def rescan(interaction: discord.Interaction):
 
         guild_users.setdefault(uid, default_user_stats())
         guild_users[uid]["total_points"] += score
+        guild_users[uid]["last_played"] = dkey
         ingested += 1
 
         if score > int(guild_users[uid]["personal_best"]["score"]):
@@ -2362,19 +3087,30 @@ async def rescan(interaction: discord.Interaction):
         if score < int(guild_users[uid]["personal_low"]["score"]):
             guild_users[uid]["personal_low"] = {"score": score, "date": dkey}
 
-        await react_safe(msg, settings["emojis"]["rescan_ingested"], "🔁")
+        to_react.append(msg)
+
+    # Discord's reaction bucket allows a small burst per channel, so react
+    # a few at a time instead of one round-trip per message.
+    rescan_emoji = settings["emojis"]["rescan_ingested"]
+    await bounded_gather(*(react_safe(msg, rescan_emoji, "🔁") for msg in to_react), limit=4)
 
     for uid in guild_users:
         played_days = {dkey for dkey, bucket in guild_scores.items() if uid in bucket}
         guild_users[uid]["days_played"] = len(played_days)
         guild_users[uid]["best_streak"] = calculate_current_streak(guild_scores, uid, tz)
+        guild_users[uid]["current_streak"] = guild_users[uid]["best_streak"]
+
+    # Merge rebuilt data back into the full files. Nothing ingested means
+    # nothing to rebuild — skip the reload and both GitHub commits.
+    if ingested:
+        async with data_lock(SCORES_PATH, USERS_PATH):
+            (all_scores, _, scores_sha), (all_users, _, users_sha) = await asyncio.gather(
+                load_guild_scores(guild_id),
+                load_guild_users(guild_id),
+            )
 
-    # Merge rebuilt data back into the full files
-    all_scores, _, scores_sha = load_guild_scores(guild_id)
-    all_users, _, users_sha = load_guild_users(guild_id)
-
-    save_guild_scores(guild_id, all_scores, guild_scores, scores_sha, f"MapTap rescan guild {guild_id}")
-    save_guild_users(guild_id, all_users, guild_users, users_sha, f"MapTap rescan guild {guild_id}")
+            await save_guild_scores(guild_id, all_scores, guild_scores, scores_sha, f"MapTap rescan guild {guild_id}")
+            await save_guild_users(guild_id, all_users, guild_users, users_sha, f"MapTap rescan guild {guild_id}")
 
     await channel.send(
         f"✅ **Rescan complete**\n"
@@ -2392,7 +3128,7 @@ async def repair_stats(interaction: discord.Interaction):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    settings, _ = await load_guild_settings(guild_id)
 
     if not has_admin_access(interaction.user, settings):
         await interaction.response.send_message("❌ No permission", ephemeral=True)
@@ -2401,36 +3137,40 @@ async def repair_stats(interaction: discord.Interaction):
     tz = get_guild_tz(settings)
     await interaction.response.send_message("🛠️ Repairing MapTap stats…", ephemeral=True)
 
-    all_scores, guild_scores, scores_sha = load_guild_scores(guild_id)
-    all_users, _, users_sha = load_guild_users(guild_id)
+    async with data_lock(SCORES_PATH, USERS_PATH):
+        (all_scores, guild_scores, scores_sha), (all_users, _, users_sha) = await asyncio.gather(
+            load_guild_scores(guild_id),
+            load_guild_users(guild_id),
+        )
 
-    rebuilt: Dict[str, Dict[str, Any]] = {}
-    played_days: Dict[str, set] = {}
+        rebuilt: Dict[str, Dict[str, Any]] = defaultdict(default_user_stats)
+        played_days: Dict[str, set] = defaultdict(set)
 
-    for dkey, bucket in guild_scores.items():
-        if not isinstance(bucket, dict):
-            continue
-        for uid, entry in bucket.items():
-            try:
-                sc = int(entry["score"])
-            except Exception:
+        for dkey, bucket in guild_scores.items():
+            if not isinstance(bucket, dict):
                 continue
+            for uid, entry in bucket.items():
+                sc = _score_of(entry)
+                if sc is None:
+                    continue
 
-            rebuilt.setdefault(uid, default_user_stats())
-            played_days.setdefault(uid, set()).add(dkey)
-            rebuilt[uid]["total_points"] += sc
+                stats = rebuilt[uid]
+                played_days[uid].add(dkey)
+                stats["total_points"] += sc
 
-            if sc > int(rebuilt[uid]["personal_best"]["score"]):
-                rebuilt[uid]["personal_best"] = {"score": sc, "date": dkey}
+                if sc > stats["personal_best"]["score"]:
+                    stats["personal_best"] = {"score": sc, "date": dkey}
 
-            if sc < int(rebuilt[uid]["personal_low"]["score"]):
-                rebuilt[uid]["personal_low"] = {"score": sc, "date": dkey}
+                if sc < stats["personal_low"]["score"]:
+                    stats["personal_low"] = {"score": sc, "date": dkey}
 
-    for uid, days in played_days.items():
-        rebuilt[uid]["days_played"] = len(days)
-        rebuilt[uid]["best_streak"] = calculate_current_streak(guild_scores, uid, tz)
+        for uid, days in played_days.items():
+            rebuilt[uid]["days_played"] = len(days)
+            rebuilt[uid]["best_streak"] = calculate_current_streak(guild_scores, uid, tz)
+            rebuilt[uid]["current_streak"] = rebuilt[uid]["best_streak"]
+            rebuilt[uid]["last_played"] = max(days)
 
-    save_guild_users(guild_id, all_users, rebuilt, users_sha, f"MapTap repair stats guild {guild_id}")
+        await save_guild_users(guild_id, all_users, dict(rebuilt), users_sha, f"MapTap repair stats guild {guild_id}")
     await interaction.followup.send(f"✅ Repair complete — users repaired: **{len(rebuilt)}**", ephemeral=False)
 
 
@@ -2450,7 +3190,7 @@ async def post_command(interaction: discord.Interaction):
         return
 
     guild_id = str(interaction.guild_id)
-    settings, _ = load_guild_settings(guild_id)
+    settings, _ = await load_guild_settings(guild_id)
 
     if not has_admin_access(interaction.user, settings):
         await interaction.response.send_message("❌ You don't have permission to do that.", ephemeral=True)
@@ -2470,7 +3210,7 @@ async def post_command(interaction: discord.Interaction):
 
     if last_score_date:
         try:
-            last_date = datetime.strptime(last_score_date, "%Y-%m-%d").date()
+            last_date = parse_date_key(last_score_date)
             if last_date not in (today, today - timedelta(days=1)):
                 streak = 0
         except Exception:
@@ -2485,7 +3225,7 @@ async def post_command(interaction: discord.Interaction):
 # =====================================================
 # BROADCAST (tracking guild admins only)
 # =====================================================
-def _is_tracking_guild_admin(interaction: discord.Interaction) -> bool:
+async def _is_tracking_guild_admin(interaction: discord.Interaction) -> bool:
     if DEV_GUILD is None:
         return False
     if str(interaction.guild_id) != GUILD_ID:
@@ -2493,7 +3233,7 @@ def _is_tracking_guild_admin(interaction: discord.Interaction) -> bool:
     if not isinstance(interaction.user, discord.Member):
         return False
 
-    tracking_settings, _ = load_guild_settings(GUILD_ID)
+    tracking_settings, _ = await load_guild_settings(GUILD_ID)
     return has_admin_access(interaction.user, tracking_settings)
 
 
@@ -2509,14 +3249,14 @@ class BroadcastModal(discord.ui.Modal, title="Broadcast Message"):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        all_settings, _ = load_all_settings()
+        all_settings, _ = await load_all_settings()
         total = len(client.guilds)
         sent = 0
         skipped = 0
 
         for guild in client.guilds:
             gid = str(guild.id)
-            settings = all_settings.get(gid, _normalize_guild_settings({}))
+            settings = all_settings.get(gid) or _normalize_guild_settings({})
             ch = get_configured_channel(settings)
             if not ch:
                 skipped += 1
@@ -2539,7 +3279,7 @@ class BroadcastModal(discord.ui.Modal, title="Broadcast Message"):
 )
 @app_commands.guilds(DEV_GUILD)
 async def broadcast(interaction: discord.Interaction):
-    if not _is_tracking_guild_admin(interaction):
+    if not await _is_tracking_guild_admin(interaction):
         await interaction.response.send_message("❌ You don't have permission to do that.", ephemeral=True)
         return
     await interaction.response.send_modal(BroadcastModal())
@@ -2554,13 +3294,13 @@ async def broadcast(interaction: discord.Interaction):
 )
 @app_commands.guilds(DEV_GUILD)
 async def nudge(interaction: discord.Interaction):
-    if not _is_tracking_guild_admin(interaction):
+    if not await _is_tracking_guild_admin(interaction):
         await interaction.response.send_message("❌ You don't have permission to do that.", ephemeral=True)
         return
 
     await interaction.response.defer(ephemeral=True, thinking=True)
 
-    all_settings, _ = load_all_settings()
+    all_settings, _ = await load_all_settings()
     configured_guild_ids = set(all_settings.keys())
 
     owners_dmed: set[int] = set()
@@ -2608,7 +3348,7 @@ async def nudge(interaction: discord.Interaction):
 )
 @app_commands.guilds(DEV_GUILD)
 async def serverlist(interaction: discord.Interaction):
-    if not _is_tracking_guild_admin(interaction):
+    if not await _is_tracking_guild_admin(interaction):
         await interaction.response.send_message("❌ No permission.", ephemeral=True)
         return
 
@@ -2678,7 +3418,7 @@ async def send_tracking_log(title: str, description: str, guild: Optional[discor
 # =====================================================
 @client.event
 async def on_guild_join(guild: discord.Guild):
-    update_topgg()
+    await update_topgg_async()
 
     try:
         await send_tracking_log(
@@ -2709,7 +3449,7 @@ async def on_guild_join(guild: discord.Guild):
 
 @client.event
 async def on_guild_remove(guild: discord.Guild):
-    update_topgg()
+    await update_topgg_async()
 
     try:
         await send_tracking_log(
@@ -2893,10 +3633,11 @@ async def vote_command(interaction: discord.Interaction):
     uid = str(interaction.user.id)
 
     # Seed user into miles_data so the poller knows to check them
-    miles_data, miles_sha = load_miles()
-    if uid not in miles_data:
-        miles_data[uid] = _default_miles_entry()
-        save_miles(miles_data, miles_sha, f"MapTap: register voter uid {uid}")
+    async with data_lock(MILES_PATH):
+        miles_data, miles_sha = await load_miles()
+        if uid not in miles_data:
+            miles_data[uid] = _default_miles_entry()
+            await save_miles(miles_data, miles_sha, f"MapTap: register voter uid {uid}")
 
     embed = discord.Embed(
         title="🗳️ Vote for MapTap Companion",
@@ -2915,14 +3656,14 @@ async def vote_command(interaction: discord.Interaction):
     description="Initialise server streaks for all MapTap servers",
 )
 async def initserverstreaks(interaction: discord.Interaction):
-    if not _is_tracking_guild_admin(interaction):
+    if not await _is_tracking_guild_admin(interaction):
         await interaction.response.send_message("❌ No permission.", ephemeral=True)
         return
 
     await interaction.response.defer(ephemeral=True)
 
     try:
-        updated, total = initialise_all_server_streaks()
+        updated, total = await initialise_all_server_streaks()
     except Exception as e:
         await interaction.followup.send(
             f"❌ Failed to initialise server streaks:\n`{e}`",
@@ -2949,7 +3690,7 @@ async def initserverstreaks(interaction: discord.Interaction):
     reason="Optional reason for the adjustment",
 )
 async def givemiles(interaction: discord.Interaction, user_id: str, amount: int, reason: str = "Manual adjustment"):
-    if not _is_tracking_guild_admin(interaction):
+    if not await _is_tracking_guild_admin(interaction):
         await interaction.response.send_message("❌ No permission.", ephemeral=True)
         return
 
@@ -2962,13 +3703,14 @@ async def givemiles(interaction: discord.Interaction, user_id: str, amount: int,
         return
 
     uid = user_id.strip()
-    miles_data, miles_sha = load_miles()
-    entry = miles_data.get(uid, _default_miles_entry())
-    old_balance = int(entry.get("miles", 0))
-    new_balance = max(0, old_balance + amount)
-    entry["miles"] = new_balance
-    miles_data[uid] = entry
-    save_miles(miles_data, miles_sha, f"MapTap: admin miles adjustment uid {uid} by {amount}")
+    async with data_lock(MILES_PATH):
+        miles_data, miles_sha = await load_miles()
+        entry = miles_data.get(uid, _default_miles_entry())
+        old_balance = int(entry.get("miles", 0))
+        new_balance = max(0, old_balance + amount)
+        entry["miles"] = new_balance
+        miles_data[uid] = entry
+        await save_miles(miles_data, miles_sha, f"MapTap: admin miles adjustment uid {uid} by {amount}")
 
     action = f"+{amount}" if amount > 0 else str(amount)
     await interaction.response.send_message(
@@ -2990,5 +3732,4 @@ if __name__ == "__main__":
     if not GITHUB_TOKEN or not GITHUB_REPO:
         raise RuntimeError("Missing GITHUB_TOKEN or GITHUB_REPO env vars")
 
-    Thread(target=run_web, daemon=True).start()
     client.run(TOKEN)